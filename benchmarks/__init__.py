@@ -0,0 +1,4 @@
+# Performance benchmarks of the Simpleline Text UI framework.
+#
+# Run the whole suite from the top directory by:
+#   make bench
@@ -0,0 +1,74 @@
+#!/bin/python3
+#
+# Compare widget buffer backends on large screens.
+#
+# Renders a long package list (similar to the package selection screens)
+# with every buffer backend and reports render time and memory held by
+# the rendered widget tree.
+#
+# Run from the top directory:
+#   PYTHONPATH=. python3 benchmarks/buffer_bench.py
+#
+
+import time
+import tracemalloc
+
+from simpleline.buffers import CharListBuffer, RowStringBuffer
+from simpleline.widgets import Widget, TextWidget, ColumnWidget
+
+BACKENDS = (CharListBuffer, RowStringBuffer)
+SIZES = (100, 1000, 5000)
+REPEAT = 3
+
+
+def package_list(items):
+    names = [TextWidget("%d) package-%d-1.%d-3.fc25.x86_64" % (i, i, i % 7))
+             for i in range(items)]
+    descriptions = [TextWidget("Description of the package number %d which is "
+                               "long enough to be wrapped on the screen" % i)
+                    for i in range(items)]
+    return ColumnWidget([(40, names), (None, descriptions)], 2)
+
+
+def measure(buffer_class, items):
+    """Return (render seconds, get_lines seconds, memory in bytes)."""
+    original = Widget.buffer_class
+    Widget.buffer_class = buffer_class
+    try:
+        render_time = lines_time = float("inf")
+        for _i in range(REPEAT):
+            w = package_list(items)
+            start = time.perf_counter()
+            w.render(120)
+            render_time = min(render_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            w.get_lines()
+            lines_time = min(lines_time, time.perf_counter() - start)
+
+        tracemalloc.start()
+        w = package_list(items)
+        before = tracemalloc.get_traced_memory()[0]
+        w.render(120)
+        memory = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+    finally:
+        Widget.buffer_class = original
+
+    return render_time, lines_time, memory
+
+
+def main():
+    print("%-16s %8s %12s %12s %12s" % ("backend", "items", "render [ms]",
+                                        "lines [ms]", "memory [kB]"))
+    for items in SIZES:
+        for backend in BACKENDS:
+            render_time, lines_time, memory = measure(backend, items)
+            print("%-16s %8d %12.2f %12.2f %12d" % (backend.__name__, items,
+                                                    render_time * 1000,
+                                                    lines_time * 1000,
+                                                    memory // 1024))
+
+
+if __name__ == "__main__":
+    main()
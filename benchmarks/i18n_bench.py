@@ -0,0 +1,64 @@
+#!/bin/python3
+#
+# Measure the cost of translations done while a frame is prepared.
+#
+# A frame of a typical hub translates the screen title, checkbox titles,
+# the prompt message with its options and a few strings with context.
+# The benchmark compares looking up the translation catalog on every call
+# (the original implementation) with the cached catalog.
+#
+# Run from the top directory:
+#   PYTHONPATH=. python3 benchmarks/i18n_bench.py
+#
+
+import gettext
+import time
+
+from simpleline.prompt import Prompt
+from simpleline.utils import i18n
+
+FRAMES = 2000
+CHECKBOXES = 12
+
+
+def uncached_(x):
+    return gettext.translation("python-simpleline", fallback=True).gettext(x) if x != "" else ""
+
+
+def uncached_C_(msgctxt, msgid):
+    ctxid = "%s\x04%s" % (msgctxt, msgid)
+    translation = uncached_(ctxid)
+    if translation == ctxid:
+        return msgid
+    return translation
+
+
+def frame(tr, ctr):
+    tr("Installation")
+    for i in range(CHECKBOXES):
+        tr("Spoke %d" % (i % 4))
+    tr(Prompt.DEFAULT_MESSAGE)
+    for description in (Prompt.REFRESH_DESCRIPTION, Prompt.CONTINUE_DESCRIPTION,
+                        Prompt.QUIT_DESCRIPTION):
+        tr(description)
+    for msgid in ("q", "c", "r", "yes", "no"):
+        ctr("TUI|Spoke Navigation", msgid)
+
+
+def measure(tr, ctr):
+    start = time.perf_counter()
+    for _i in range(FRAMES):
+        frame(tr, ctr)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    uncached = measure(uncached_, uncached_C_)
+    cached = measure(i18n._, i18n.C_)
+    print("%-10s %14s" % ("catalog", "frame [us]"))
+    print("%-10s %14.1f" % ("uncached", uncached * 1000000))
+    print("%-10s %14.1f" % ("cached", cached * 1000000))
+
+
+if __name__ == "__main__":
+    main()
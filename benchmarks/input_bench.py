@@ -0,0 +1,57 @@
+#!/bin/python3
+#
+# Measure throughput of App.raw_input() with scripted input.
+#
+# The standard input is replaced by a prepared text and the number of
+# prompts answered per second is reported for a thread started for every
+# prompt (the original implementation) and for the long-lived input thread.
+#
+# Run from the top directory:
+#   PYTHONPATH=. python3 benchmarks/input_bench.py
+#
+
+import io
+import sys
+import threading
+import time
+
+from simpleline.base import App
+from simpleline.input import InputReader, ThreadInputReader
+from simpleline.output import BufferedOutput
+
+PROMPTS = 5000
+
+
+class ThreadPerPromptReader(InputReader):
+    """Start a new thread for every prompt."""
+
+    def request(self, app, prompt, hidden):
+        thread = threading.Thread(target=app._thread_input, name="InputThread",
+                                  args=(app.queue_instance, prompt, hidden))
+        thread.daemon = True
+        thread.start()
+
+
+def measure(reader):
+    app = App("Benchmark", output=BufferedOutput(io.StringIO()), input_reader=reader)
+    stdin = sys.stdin
+    sys.stdin = io.StringIO("answer\n" * PROMPTS)
+    try:
+        start = time.perf_counter()
+        for _i in range(PROMPTS):
+            app.raw_input("prompt: ")
+        elapsed = time.perf_counter() - start
+    finally:
+        sys.stdin = stdin
+        reader.close()
+    return PROMPTS / elapsed
+
+
+def main():
+    print("%-24s %14s" % ("reader", "prompts/s"))
+    for reader in (ThreadPerPromptReader(), ThreadInputReader()):
+        print("%-24s %14.0f" % (type(reader).__name__, measure(reader)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/bin/python3
+#
+# Render deeply nested column and center widgets.
+#
+# Every column and every level of nesting reads the width of the widget
+# rendered so far. When the width is computed by scanning all rows, every
+# read costs as much as the height of the widget; the cached width keeps
+# the reads constant. The benchmark reports the render time and the time
+# needed to read the width of every widget in the rendered tree.
+#
+# Run from the top directory:
+#   PYTHONPATH=. python3 benchmarks/nesting_bench.py
+#
+
+import time
+
+from simpleline.buffers import CharListBuffer
+from simpleline.widgets import Widget, TextWidget, ColumnWidget, CenterWidget
+
+DEPTHS = (5, 10, 20, 40)
+COLUMNS = 20
+ROWS = 200
+REPEAT = 5
+
+
+class ScanningBuffer(CharListBuffer):
+    """Buffer computing the width on every read (the original behaviour)."""
+
+    @property
+    def width(self):
+        return max((len(r) for r in self._rows), default=0)
+
+
+def nested(depth):
+    """Return the top widget and list of all widgets in the tree."""
+    column = "\n".join("x" * ROWS)
+    w = ColumnWidget([(1, [TextWidget(column)]) for _i in range(COLUMNS)])
+    tree = [w]
+    for level in range(depth):
+        if level % 2:
+            w = CenterWidget(w)
+        else:
+            w = ColumnWidget([(4, [TextWidget("%d" % level)]), (None, [w])], 1)
+        tree.append(w)
+    return w, tree
+
+
+def measure(buffer_class, depth):
+    """Return (render seconds, seconds to read width of every widget)."""
+    original = Widget.buffer_class
+    Widget.buffer_class = buffer_class
+    try:
+        render_time = read_time = float("inf")
+        for _i in range(REPEAT):
+            w, tree = nested(depth)
+            start = time.perf_counter()
+            w.render(200)
+            render_time = min(render_time, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for item in tree:
+                item.width  # pylint: disable=pointless-statement
+            read_time = min(read_time, time.perf_counter() - start)
+    finally:
+        Widget.buffer_class = original
+    return render_time, read_time
+
+
+def main():
+    print("%8s %18s %18s %18s %18s" % ("depth", "scan render [ms]", "cached render [ms]",
+                                       "scan width [us]", "cached width [us]"))
+    for depth in DEPTHS:
+        scan_render, scan_read = measure(ScanningBuffer, depth)
+        cached_render, cached_read = measure(CharListBuffer, depth)
+        print("%8d %18.2f %18.2f %18.1f %18.1f" % (depth, scan_render * 1000,
+                                                   cached_render * 1000,
+                                                   scan_read * 1000000,
+                                                   cached_read * 1000000))
+
+
+if __name__ == "__main__":
+    main()
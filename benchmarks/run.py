@@ -0,0 +1,323 @@
+#!/bin/python3
+#
+# Benchmark suite of the hot paths of Simpleline.
+#
+# Measures writing to widgets, rendering of the standard widgets, dispatch
+# of App events, input latency under message floods, a scripted App.run()
+# with synthetic screens of growing size and headless hub and spoke
+# sessions. Results are printed as a table and optionally stored as JSON.
+# When a baseline JSON file is given, benchmarks slower than the baseline
+# by more than the threshold are reported and the script fails.
+#
+# Run from the top directory:
+#   PYTHONPATH=. python3 benchmarks/run.py [-o results.json] [-b baseline.json]
+#
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+
+from simpleline.base import App, UIScreen
+from simpleline.communication.communication import hubQ, HUB_PRIORITIES
+from simpleline.headless import ScriptedInput, HeadlessDriver
+from simpleline.output import BufferedOutput
+from simpleline.prompt import Prompt
+from simpleline.utils.wrap import wrap_cache
+from simpleline.widgets import Widget, TextWidget, ColumnWidget, CenterWidget, CheckboxWidget, \
+    ListWidget
+
+from benchmarks import buffer_bench, nesting_bench, i18n_bench, input_bench
+
+SIZES = (10, 100, 1000)
+REPEAT = 5
+
+LOREM = (u"Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod "
+         u"tempor incididunt ut labore et dolore magna aliqua. ")
+
+
+def best_time(func, repeat=REPEAT):
+    """Return the shortest time of repeated func() calls in seconds."""
+    best = float("inf")
+    for _i in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_write():
+    for size in SIZES:
+        text = (LOREM * size)[:size * 100]
+        for wordwrap in (False, True):
+            def write():
+                # measure the wrapping, not the cache
+                wrap_cache.clear()
+                w = Widget(max_width=80)
+                w.write(text, wordwrap=wordwrap)
+
+            yield "widget_write", {"chars": len(text), "wordwrap": wordwrap}, best_time(write)
+
+
+def bench_render():
+    for size in SIZES:
+        text = TextWidget(LOREM * size)
+        yield "render_text", {"items": size}, best_time(lambda: text.render(80))
+
+        center = CenterWidget(TextWidget(LOREM * size))
+        yield "render_center", {"items": size}, best_time(lambda: center.render(80))
+
+        columns = ColumnWidget([(30, [TextWidget(u"%d) item" % i) for i in range(size)]),
+                                (None, [TextWidget(LOREM) for _i in range(size)])], 2)
+        yield "render_column", {"items": size}, best_time(lambda: columns.render(80))
+
+        checkboxes = [CheckboxWidget(title=u"Spoke %d" % i, text=LOREM, completed=i % 2)
+                      for i in range(size)]
+
+        def render_checkboxes():
+            for c in checkboxes:
+                c.render(38)
+
+        yield "render_checkbox", {"items": size}, best_time(render_checkboxes)
+
+    # only the visible page is rendered, the time does not grow with the items
+    for size in (1000, 100000, 10000000):
+        items = ListWidget(range(size), page_size=20)
+
+        def render_list():
+            items.jump_to(size // 2)
+            items.render(80)
+
+        yield "render_list", {"items": size}, best_time(render_list)
+
+
+def bench_process_events():
+    app = App("Benchmark", output=BufferedOutput(io.StringIO()))
+    handled = []
+    app.register_event_handler(hubQ.HUB_CODE_MESSAGE, lambda event, data: handled.append(event))
+
+    for size in (100, 1000, 10000):
+        def dispatch():
+            for i in range(size):
+                app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message %d" % i]))
+            app.process_events()
+            handled.clear()
+
+        yield "process_events", {"events": size}, best_time(dispatch)
+
+
+class SyntheticScreen(UIScreen):
+    """Screen with items of columns and checkboxes."""
+
+    def __init__(self, app, items):
+        super().__init__(app, screen_height=items * 4 + 10)
+        self._items = items
+
+    def refresh(self, args=None):
+        super().refresh(args)
+        left = [CheckboxWidget(title=u"Spoke %d" % i, text=u"Status of the spoke",
+                               completed=i % 2) for i in range(self._items)]
+        right = [TextWidget(LOREM) for _i in range(self._items)]
+        self._window += [CenterWidget(TextWidget(u"Synthetic hub")), u"",
+                         ColumnWidget([(38, left), (38, right)], 2), u""]
+        return True
+
+    def input(self, args, key):
+        if key == Prompt.CONTINUE:
+            return key
+        # ask for redraw by processing the input
+        return True
+
+
+def bench_input_latency():
+    for size in (1000, 10000):
+        for priorities in (False, True):
+            def wait_for_input():
+                app = App("Benchmark", output=BufferedOutput(io.StringIO()),
+                          event_priorities=HUB_PRIORITIES if priorities else None)
+                app.register_event_handler(hubQ.HUB_CODE_MESSAGE,
+                                           lambda event, data: TextWidget(event[1][1]).render(80))
+                # the input comes after a flood of status messages
+                for i in range(size):
+                    app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message %d" % i]))
+                app.queue_instance.put((hubQ.HUB_CODE_INPUT, ["answer"]))
+                start = time.perf_counter()
+                app.process_events(return_at=hubQ.HUB_CODE_INPUT)
+                return time.perf_counter() - start
+
+            latency = min(wait_for_input() for _i in range(3))
+            yield "input_latency", {"messages": size, "priorities": priorities}, latency
+
+
+def bench_app_run():
+    frames = 50
+    for size in SIZES:
+        def run():
+            app = App("Benchmark", output=BufferedOutput(io.StringIO()),
+                      input_reader=ScriptedInput(["1"] * (frames - 1) + [Prompt.CONTINUE],
+                                                 show_prompt=False))
+            app.schedule_screen(SyntheticScreen(app, size))
+            app.run()
+
+        yield "app_run", {"items": size, "frames": frames}, best_time(run, repeat=3)
+
+
+class SpokeScreen(UIScreen):
+    """Spoke asking for one value and returning to the hub."""
+
+    title = u"Spoke"
+
+    def __init__(self, app, hub):
+        super().__init__(app)
+        self._hub = hub
+
+    def refresh(self, args=None):
+        super().refresh(args)
+        self._window += [TextWidget(u"Value: %s" % self._hub.values[args]), u""]
+        return True
+
+    def prompt(self, args=None):
+        return Prompt(u"Enter new value")
+
+    def input(self, args, key):
+        self._hub.values[args] = key
+        self.close()
+        return None
+
+
+class HubScreen(UIScreen):
+    """Hub with spokes selected by numbers."""
+
+    title = u"Hub"
+
+    def __init__(self, app, spokes):
+        super().__init__(app)
+        self.values = [u"" for _i in range(spokes)]
+
+    def refresh(self, args=None):
+        super().refresh(args)
+        boxes = [CheckboxWidget(title=u"%d) Spoke %d" % (i + 1, i), text=v or u"Not set",
+                                completed=bool(v)) for i, v in enumerate(self.values)]
+        self._window += [ColumnWidget([(38, boxes[::2]), (38, boxes[1::2])], 2), u""]
+        return True
+
+    def input(self, args, key):
+        if key.isdigit() and 0 < int(key) <= len(self.values):
+            self.app.switch_screen_with_return(SpokeScreen(self.app, self), int(key) - 1)
+            return None
+        return key
+
+
+def bench_headless():
+    sessions = 100
+    spokes = 10
+    answers = []
+    for i in range(spokes):
+        answers += [str(i + 1), u"value %d" % i]
+    answers.append(Prompt.CONTINUE)
+
+    def run():
+        for _i in range(sessions):
+            driver = HeadlessDriver(answers)
+            app = driver.create_app("Benchmark")
+            app.schedule_screen(HubScreen(app, spokes))
+            driver.run()
+
+    yield "headless_sessions", {"sessions": sessions, "spokes": spokes}, best_time(run, repeat=3)
+
+
+def bench_buffers():
+    for items in buffer_bench.SIZES:
+        for backend in buffer_bench.BACKENDS:
+            render_time, lines_time, _memory = buffer_bench.measure(backend, items)
+            params = {"items": items, "backend": backend.__name__}
+            yield "buffer_render", params, render_time
+            yield "buffer_get_lines", params, lines_time
+
+
+def bench_nesting():
+    for depth in nesting_bench.DEPTHS:
+        render_time, _read_time = nesting_bench.measure(nesting_bench.CharListBuffer, depth)
+        yield "nested_render", {"depth": depth}, render_time
+
+
+def bench_i18n():
+    yield "i18n_frame", {}, i18n_bench.measure(i18n_bench.i18n._, i18n_bench.i18n.C_)
+
+
+def bench_input():
+    prompts_per_second = input_bench.measure(input_bench.ThreadInputReader())
+    yield "raw_input", {"prompts": input_bench.PROMPTS}, 1 / prompts_per_second
+
+
+BENCHMARKS = [bench_write, bench_render, bench_process_events, bench_input_latency,
+              bench_app_run, bench_headless,
+              bench_buffers, bench_nesting, bench_i18n, bench_input]
+
+
+def result_key(result):
+    params = ",".join("%s=%s" % (k, v) for k, v in sorted(result["params"].items()))
+    return "%s[%s]" % (result["name"], params)
+
+
+def run_suite(selected=None):
+    results = []
+    for benchmark in BENCHMARKS:
+        if selected and benchmark.__name__[len("bench_"):] not in selected:
+            continue
+        for name, params, seconds in benchmark():
+            results.append({"name": name, "params": params, "seconds": seconds})
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return list of (key, baseline seconds, seconds) slower than threshold."""
+    base = {result_key(r): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        key = result_key(result)
+        if key in base and result["seconds"] > base[key] * threshold:
+            regressions.append((key, base[key], result["seconds"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Simpleline benchmarks.")
+    parser.add_argument("-o", "--output", help="store results to this JSON file")
+    parser.add_argument("-b", "--baseline", help="compare results with this JSON file")
+    parser.add_argument("-t", "--threshold", type=float, default=1.25,
+                        help="ratio to the baseline reported as regression (default 1.25)")
+    parser.add_argument("benchmarks", nargs="*",
+                        help="benchmarks to run (%s)" % ", ".join(
+                            b.__name__[len("bench_"):] for b in BENCHMARKS))
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.benchmarks)
+    for result in results:
+        print("%-60s %12.3f ms" % (result_key(result), result["seconds"] * 1000))
+
+    if args.output:
+        data = {"python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "results": results}
+        with open(args.output, "w") as f:
+            json.dump(data, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for key, base, seconds in regressions:
+            print("REGRESSION %s: %.3f ms -> %.3f ms" % (key, base * 1000, seconds * 1000))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
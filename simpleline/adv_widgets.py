@@ -21,6 +21,7 @@ from simpleline import INPUT_PROCESSED
 from simpleline import widgets
 from simpleline.prompt import Prompt
 from simpleline.utils.i18n import _, N_, C_
+from simpleline.utils.textfile import text_file_cache
 from simpleline.base import UIScreen
 
 
@@ -159,7 +160,12 @@ class YesNoDialog(UIScreen):
 
 
 class HelpScreen(UIScreen):
-    """Screen to display a help message."""
+    """Screen to display a help message.
+
+    The help file is read through the text_file_cache, so it is read again
+    only when it changes. The text widget is kept between refreshes and
+    rendered again only when the text or the width change.
+    """
 
     title = N_("Help")
 
@@ -173,6 +179,7 @@ class HelpScreen(UIScreen):
         """
         super().__init__(app)
         self.help_path = help_path
+        self._help_widget = None
 
     def refresh(self, args=None):
         """ Show the help. """
@@ -180,10 +187,15 @@ class HelpScreen(UIScreen):
         help_message = _("The help is not available.")
 
         if self.help_path:
-            with open(self.help_path, 'r') as f:
-                help_message = f.read()
+            help_message = text_file_cache.read(self.help_path)
+
+        if self._help_widget is None:
+            self._help_widget = widgets.TextWidget(help_message)
+            self._help_widget.render_cache = True
+        elif self._help_widget.text != help_message:
+            self._help_widget.text = help_message
 
-        self._window += [widgets.TextWidget(help_message), ""]
+        self._window += [self._help_widget, ""]
         return True
 
     def input(self, args, key):
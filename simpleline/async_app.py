@@ -0,0 +1,316 @@
+# Asyncio integration of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["AsyncApp", "AsyncInputReader"]
+
+import io
+import os
+import sys
+import queue
+import asyncio
+import inspect
+import threading
+import contextvars
+from simpleline.base import App, ExitMainLoop
+from simpleline.communication import EventQueue
+from simpleline.communication.communication import hubQ
+from simpleline.input import InputReader
+
+# set in coroutine event handlers (and tasks started by them) to the event
+# which is set while the UI thread is waiting for the handler
+_ui_waiting = contextvars.ContextVar("ui_waiting", default=None)
+
+
+def _set_result(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
+
+
+class AsyncInputReader(InputReader):
+    """Input reader reading the standard input through the asyncio loop.
+
+    The file descriptor of the standard input is read directly, data already
+    buffered by sys.stdin are not seen by the reader. Hidden input and
+    standard input which can't be watched by the loop (no file descriptor,
+    regular files) are read in the executor of the loop.
+    """
+
+    def __init__(self, loop=None):
+        """
+        :param loop: loop to read the input in, AsyncApp sets it when started
+        :type loop: asyncio event loop
+        """
+        self.loop = loop
+        self._fd = None
+        self._app = None
+        # data read from the standard input which were not returned yet
+        self._data = b""
+        self._eof = False
+
+    def request(self, app, prompt, hidden):
+        if self.loop is None:
+            raise RuntimeError("The input reader is not attached to an event loop.")
+        self.loop.call_soon_threadsafe(self._start, app, prompt, hidden)
+
+    def close(self):
+        if self._fd is not None:
+            self.loop.remove_reader(self._fd)
+            self._fd = None
+
+    def _start(self, app, prompt, hidden):
+        if not hidden:
+            try:
+                fd = sys.stdin.fileno()
+                if not self._eof and b"\n" not in self._data:
+                    self.loop.add_reader(fd, self._read, fd)
+            except (AttributeError, ValueError, io.UnsupportedOperation, OSError,
+                    NotImplementedError):
+                pass
+            else:
+                app._write_prompt(prompt)  # pylint: disable=protected-access
+                self._app = app
+                if self._eof or b"\n" in self._data:
+                    self._deliver()
+                else:
+                    self._fd = fd
+                return
+
+        self.loop.run_in_executor(None, app._thread_input,  # pylint: disable=protected-access
+                                  app.queue_instance, prompt, hidden)
+
+    def _read(self, fd):
+        chunk = os.read(fd, 4096)
+        if chunk:
+            self._data += chunk
+        else:
+            self._eof = True
+
+        if self._eof or b"\n" in self._data:
+            self.close()
+            self._deliver()
+
+    def _deliver(self):
+        # empty string is returned at the end of the input
+        line, _newline, self._data = self._data.partition(b"\n")
+        encoding = getattr(sys.stdin, "encoding", None) or "utf-8"
+        data = line.decode(encoding, errors="replace")
+
+        app = self._app
+        self._app = None
+        app.queue_instance.put((hubQ.HUB_CODE_INPUT, [data]))
+
+
+class AsyncApp(App):
+    """Application embeddable to an asyncio event loop.
+
+    Start it by awaiting run_async(). The standard input is read through the
+    event loop and the code running in the loop can wait for modal screens
+    by switch_screen_modal_async() or run functions in the UI by call_in_ui().
+    Coroutine functions can be registered as event handlers.
+
+    Screens are processed by a dedicated UI thread which runs the regular
+    App mainloop, so existing UIScreen subclasses calling the blocking
+    raw_input() or switch_screen_modal() work unchanged without blocking
+    the event loop.
+    """
+
+    # event used to run functions in the UI thread
+    CALL_EVENT = "async_call"
+
+    def __init__(self, title, quit_screen=None, width=80, queue_instance=None,
+                 quit_message=None, output=None, input_reader=None, fast_forward=False,
+                 **kwargs):
+        """See App for the description of arguments.
+
+        The input_reader defaults to AsyncInputReader, other keyword
+        arguments are passed to App.
+        """
+        super().__init__(title, quit_screen=quit_screen, width=width,
+                         queue_instance=queue_instance, quit_message=quit_message,
+                         output=output, input_reader=input_reader or AsyncInputReader(),
+                         fast_forward=fast_forward, **kwargs)
+        self._loop = None
+        # futures resolved when the modal screen is closed
+        self._modal_futures = {}
+        # modal screens waiting until the current input is processed
+        self._deferred_screens = []
+        super().register_event_handler(self.CALL_EVENT, self._call_handler)
+        if isinstance(self.queue_instance, EventQueue):
+            # the event loop must not wait for a place in the full queue
+            self.queue_instance.critical.add(self.CALL_EVENT)
+
+    @property
+    def loop(self):
+        """Event loop the application runs in."""
+        return self._loop
+
+    async def run_async(self):
+        """Run the application and return when it ends.
+
+        :return: see App.run()
+        :rtype: bool
+        """
+        self._loop = asyncio.get_running_loop()
+        if isinstance(self._input_reader, AsyncInputReader):
+            self._input_reader.loop = self._loop
+
+        done = self._loop.create_future()
+        thread = threading.Thread(target=self._ui_thread, args=(done,), name="UIThread")
+        thread.daemon = True
+        thread.start()
+        try:
+            return await done
+        finally:
+            self._input_reader.close()
+            for future in self._modal_futures.values():
+                future.cancel()
+            self._modal_futures.clear()
+
+    def _ui_thread(self, done):
+        try:
+            result = self.run()
+        except BaseException as e:  # pylint: disable=broad-except
+            self._loop.call_soon_threadsafe(_set_exception, done, e)
+        else:
+            self._loop.call_soon_threadsafe(_set_result, done, result)
+
+    def register_event_handler(self, event, callback, data=None):
+        """Register event handler, see App.register_event_handler().
+
+        Coroutine functions are run in the event loop and the UI thread waits
+        until they are finished. Such handlers therefore can't await
+        call_in_ui() or switch_screen_modal_async(), which need the UI thread,
+        these raise RuntimeError when used in a handler. Schedule a separate
+        task by asyncio.ensure_future() to work with the UI after the handler
+        is finished.
+        """
+        if inspect.iscoroutinefunction(callback):
+            callback = self._wrap_coroutine(callback)
+        super().register_event_handler(event, callback, data)
+
+    def _wrap_coroutine(self, coroutine_function):
+        async def run_handler(event, data):
+            waiting = threading.Event()
+            waiting.set()
+            _ui_waiting.set(waiting)
+            try:
+                await coroutine_function(event, data)
+            finally:
+                # tasks started by the handler run when the UI thread continues
+                waiting.clear()
+
+        def handler(event, data):
+            future = asyncio.run_coroutine_threadsafe(run_handler(event, data), self._loop)
+            future.result()
+
+        handler.__qualname__ = coroutine_function.__qualname__
+        return handler
+
+    async def call_in_ui(self, func, *args):
+        """Run func in the UI thread and return its result.
+
+        The function is run when the UI thread processes events, which
+        happens also while it is waiting for the user input.
+
+        :raises RuntimeError: when called from a coroutine event handler
+                              the UI thread is waiting for
+        """
+        self._check_ui_waiting()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        message = (self.CALL_EVENT, [func, args, future])
+        try:
+            self.queue_instance.put_nowait(message)
+        except queue.Full:
+            # bounded queue of other type than EventQueue, wait outside of the loop
+            await loop.run_in_executor(None, self.queue_instance.put, message)
+        return await future
+
+    @staticmethod
+    def _check_ui_waiting():
+        waiting = _ui_waiting.get()
+        if waiting is not None and waiting.is_set():
+            raise RuntimeError("The UI thread is waiting for this coroutine event handler, "
+                               "schedule a task to work with the UI.")
+
+    def _call_handler(self, event, data):
+        func, args, future = event[1]
+        loop = future.get_loop()
+        try:
+            result = func(*args)
+        except ExitMainLoop:
+            loop.call_soon_threadsafe(_set_result, future, None)
+            raise
+        except Exception as e:  # pylint: disable=broad-except
+            loop.call_soon_threadsafe(_set_exception, future, e)
+        else:
+            loop.call_soon_threadsafe(_set_result, future, result)
+
+    async def switch_screen_modal_async(self, ui, args=None):
+        """Show the screen and wait until it is closed.
+
+        The current screen is kept in the stack and shown again when the new
+        one is closed. The new screen is shown with the next redraw, if the
+        user is asked for input right now, the screen is shown after the input
+        is processed by the current screen.
+
+        :param ui: screen to show
+        :type ui: UIScreen instance
+
+        :param args: optional argument, please see switch_screen for details
+        :type args: anything
+
+        :return: the closed screen
+        :rtype: UIScreen instance
+
+        :raises RuntimeError: when called from a coroutine event handler
+                              the UI thread is waiting for
+        """
+        self._check_ui_waiting()
+        closed = asyncio.get_running_loop().create_future()
+        self._modal_futures[ui] = closed
+        await self.call_in_ui(self._show_modal, ui, args)
+        return await closed
+
+    def _show_modal(self, ui, args):
+        if self._input_pending:
+            self._deferred_screens.append((ui, args))
+        else:
+            self.switch_screen_with_return(ui, args)
+
+    def input(self, args, key):
+        try:
+            return super().input(args, key)
+        finally:
+            while self._deferred_screens:
+                self.switch_screen_with_return(*self._deferred_screens.pop(0))
+
+    def close_screen(self, scr=None):
+        screen = self._screens[-1][0] if self._screens else None
+        try:
+            super().close_screen(scr)
+        finally:
+            future = self._modal_futures.pop(screen, None)
+            if future is not None:
+                future.get_loop().call_soon_threadsafe(_set_result, future, screen)
@@ -22,12 +22,22 @@
 __all__ = ["App", "UIScreen"]
 
 import sys
+import time
 import queue
+import heapq
 import getpass
+import itertools
 import threading
+from collections import deque
+from simpleline.communication import EventQueue
 from simpleline.communication.communication import hubQ
 from simpleline.utils.i18n import _, N_
-from simpleline.widgets import Widget, TextWidget
+from simpleline.input import ThreadInputReader
+from simpleline.metrics import AppMetrics
+from simpleline.output import LineOutput
+from simpleline.profiling import NULL_SPAN
+from simpleline.timers import Timers
+from simpleline.widgets import Widget, TextWidget, render_stats
 from simpleline.prompt import Prompt
 
 RAW_INPUT_LOCK = threading.Lock()
@@ -68,10 +78,17 @@ class App(object):
     STOP_MAINLOOP = False
     NOP = None
 
+    # priority of events without their own priority, lower is dispatched sooner
+    DEFAULT_EVENT_PRIORITY = 1
+
+    # event waking up the UI thread when a timer is added from another thread
+    TIMER_WAKEUP_EVENT = "timer_wakeup"
+
     _current_screen = None
 
     def __init__(self, title, quit_screen=None, width=80, queue_instance=None,
-                 quit_message=None):
+                 quit_message=None, output=None, input_reader=None, fast_forward=False,
+                 tracer=None, queue_size=0, event_priorities=None):
         """
         :param title: application title for whenever we need to display app name
         :type title: str
@@ -82,31 +99,80 @@ class App(object):
         :param width: screen width for rendering purposes
         :type width: int
 
-        :param queue_instance: if specified use this message queue for communication
+        :param queue_instance: if specified use this message queue for communication,
+                               EventQueue is used by default
         :type queue_instance: queue.Queue()
 
         :param quit_message: this message will be send to quit_screen
         :type quit_message: str
+
+        :param output: if specified use this output instead of writing lines to stdout
+        :type output: instance of simpleline.output.OutputSink
+
+        :param input_reader: if specified use this reader to get the user input
+        :type input_reader: instance of simpleline.input.InputReader
+
+        :param fast_forward: do not show screens while the input reader has
+                             prepared answers (see fast_forward property)
+        :type fast_forward: bool
+
+        :param tracer: if specified measure time spent in screens and handlers
+        :type tracer: instance of simpleline.profiling.Tracer
+
+        :param queue_size: maximal number of messages in the default queue_instance,
+                           0 is unlimited (see EventQueue for the overflow handling)
+        :type queue_size: int
+
+        :param event_priorities: dispatch events by priorities, see set_event_priority()
+        :type event_priorities: dict event id -> priority, for example
+                                simpleline.communication.communication.HUB_PRIORITIES
         """
         self._header = title
         self._redraw = True
         self._spacer = "\n".join(2 * [width * "="])
         self._width = width
-        self._input_thread = None
+        self._input_reader = input_reader or ThreadInputReader()
+        self._input_pending = False
+        self._pending_prompt = None
+        self._fast_forward = fast_forward
+        self._fast_forwarding = False
+        self._tracer = tracer
+        self._metrics = AppMetrics()
         self.quit_screen = quit_screen
         self.quit_message = quit_message or N_(u"Do you really want to quit?")
+        self._output = output or LineOutput()
 
         # async control queue
         if queue_instance:
             self.queue_instance = queue_instance
         else:
-            self.queue_instance = queue.Queue()
+            self.queue_instance = EventQueue(queue_size)
+
+        # the input and exceptions can't wait for a free place in the queue
+        if isinstance(self.queue_instance, EventQueue):
+            self.queue_instance.critical.update((hubQ.HUB_CODE_INPUT, hubQ.HUB_CODE_EXCEPTION))
 
         # event handlers
         # key: event id
         # value: list of tuples (callback, data)
         self._handlers = {}
 
+        # coalesced events
+        # key: event id
+        # value: function returning key of the message or None
+        self._coalescing = {}
+        # events taken from the queue_instance but not processed yet, deque or
+        # heap of (priority, order, event) when priorities are used
+        self._events = deque()
+        self._priorities = {}
+        self._event_order = itertools.count()
+        for event, priority in (event_priorities or {}).items():
+            self.set_event_priority(event, priority)
+
+        # scheduled calls and the thread running them
+        self._timers = Timers()
+        self._dispatch_thread = None
+
         # screen stack contains triplets
         #  UIScreen to show
         #  arguments for it's refresh and setup method
@@ -137,11 +203,219 @@ class App(object):
             self._handlers[event] = []
         self._handlers[event].append((callback, data))
 
+    def coalesce_events(self, event, key=None):
+        """Dispatch only the latest message of the event in one process_events call.
+
+        Messages waiting in the queue are taken at once and older messages
+        of the event are dropped when a newer message with the same key is
+        among them. Useful for frequent status updates where only the last
+        one is interesting, for example to keep the last message of every
+        spoke:
+
+            app.coalesce_events(hubQ.HUB_CODE_MESSAGE, key=lambda event: event[1][0])
+
+        :param event: the id of the event
+        :type event: number|string
+
+        :param key: function returning key of the message, without it all
+                    messages of the event share one key
+        :type key: func(event_message)
+        """
+        if event in (hubQ.HUB_CODE_INPUT, hubQ.HUB_CODE_EXCEPTION):
+            raise ValueError("Input and exception events can't be coalesced.")
+        self._coalescing[event] = key
+
+    def set_event_priority(self, event, priority):
+        """Dispatch the event by its priority.
+
+        When priorities are used, process_events takes all waiting messages
+        and dispatches them from the lowest priority value. Events of the
+        same priority are dispatched in the order they were sent. Events
+        without priority have DEFAULT_EVENT_PRIORITY.
+
+        :param event: the id of the event
+        :type event: number|string
+
+        :param priority: priority of the event, lower is dispatched sooner
+        :type priority: int
+        """
+        self._priorities[event] = priority
+        entries = list(self._events) if isinstance(self._events, deque) else \
+            [entry[2:] for entry in sorted(self._events)]
+        self._events = []
+        for enqueued, event in entries:
+            self._push_event(enqueued, event)
+
+    def _push_event(self, enqueued, event):
+        """Add the message to the events to process.
+
+        :param enqueued: time.perf_counter() of the send if the latency of the
+                         message is measured at the dispatch, see EventQueue.get_timed()
+        :type enqueued: float or None
+
+        :param event: the message
+        :type event: (code, [arguments])
+        """
+        if self._priorities:
+            priority = self._priorities.get(event[0], self.DEFAULT_EVENT_PRIORITY)
+            heapq.heappush(self._events, (priority, next(self._event_order), enqueued, event))
+        else:
+            self._events.append((enqueued, event))
+
+    def _pop_event(self):
+        if self._priorities:
+            enqueued, event = heapq.heappop(self._events)[2:]
+        else:
+            enqueued, event = self._events.popleft()
+        if enqueued is not None:
+            self.queue_instance.add_latency(event[0], time.perf_counter() - enqueued)
+        return event
+
+    def _fetch_events(self, block=True):
+        """Move messages from the queue_instance to the events to process.
+
+        :param block: wait for a message if there is none
+        :type block: bool
+        """
+        if not self._coalescing and not self._priorities:
+            # dispatched right away, the queue measures the latency by itself
+            first = self._get_event() if block else None
+            if first is not None:
+                self._push_event(None, first)
+            return
+
+        # the messages can wait for the dispatch, their latency is measured
+        # when they are dispatched and not at all for the coalesced ones
+        timed = isinstance(self.queue_instance, EventQueue)
+        batch = []
+        if block:
+            first = self._get_event(timed)
+            if first is not None:
+                batch.append(first if timed else (None, first))
+
+        # take what is waiting right now, not what producers add meanwhile
+        count = self.queue_instance.qsize()
+        room = self._fetch_room()
+        if room is not None:
+            count = min(count, room - len(batch))
+        for _i in range(count):
+            try:
+                if timed:
+                    batch.append(self.queue_instance.get_timed(block=False))
+                else:
+                    batch.append((None, self.queue_instance.get_nowait()))
+            except queue.Empty:
+                break
+
+        # keep the latest message of every key
+        seen = set()
+        entries = []
+        for enqueued, event in reversed(batch):
+            if event[0] in self._coalescing:
+                key_func = self._coalescing[event[0]]
+                key = (event[0], key_func(event) if key_func else None)
+                if key in seen:
+                    self._metrics.coalesced += 1
+                    continue
+                seen.add(key)
+            entries.append((enqueued, event))
+
+        entries.reverse()
+        for enqueued, event in entries:
+            self._push_event(enqueued, event)
+
+    def _fetch_room(self):
+        """Return how many messages can be taken from a bounded queue_instance now.
+
+        Messages taken from a bounded queue are limited by its size, so the
+        events waiting for processing do not grow without limit and the
+        producers are still blocked by the full queue. None is returned
+        for unbounded queues.
+        """
+        maxsize = getattr(self.queue_instance, "maxsize", 0)
+        if maxsize > 0:
+            return max(0, maxsize - len(self._events))
+        return None
+
+    def call_later(self, delay, callback, *args):
+        """Call the callback in the UI thread after delay seconds.
+
+        Timers run when the application processes events, also while it is
+        waiting for the user input. Can be called from any thread.
+
+        :param delay: seconds to wait
+        :type delay: float
+
+        :param callback: function to call with args
+        :type callback: func(*args)
+
+        :return: handle of the timer which can be cancelled
+        :rtype: simpleline.timers.TimerHandle instance
+        """
+        return self._add_timer(delay, callback, args)
+
+    def call_every(self, interval, callback, *args):
+        """Call the callback in the UI thread every interval seconds.
+
+        The first call is after interval seconds. Calls are skipped when the
+        UI thread is busy longer than the interval. See call_later().
+
+        :param interval: seconds between calls
+        :type interval: float
+
+        :return: handle of the timer, cancel it to stop the calls
+        :rtype: simpleline.timers.TimerHandle instance
+
+        :raises ValueError: when the interval is not positive
+        """
+        return self._add_timer(interval, callback, args, interval)
+
+    def _add_timer(self, delay, callback, args, interval=None):
+        handle, first = self._timers.add(delay, callback, args, interval)
+        if first and threading.get_ident() != self._dispatch_thread:
+            # the UI thread may wait for an event without a timeout
+            try:
+                self.queue_instance.put_nowait((self.TIMER_WAKEUP_EVENT, []))
+            except queue.Full:
+                # there are events to process, the wait will end anyway
+                pass
+        return handle
+
+    def _run_timers(self):
+        """Call callbacks of the timers which are due."""
+        if not self._timers:
+            return
+
+        for handle in self._timers.pop_due():
+            try:
+                with self.trace("timer", detail=handle.callback):
+                    handle.callback(*handle.args)
+            except ExitMainLoop:
+                raise
+            except Exception:    # pylint: disable=broad-except
+                send_exception(self.queue_instance, sys.exc_info())
+
+    def _get_event(self, timed=False):
+        """Wait for a message from the queue_instance until the next timer is due.
+
+        :param timed: return the message with the time it was sent (the
+                      queue_instance has to be an EventQueue)
+        :type timed: bool
+
+        :return: the message, (enqueued, message) if timed or None if a timer is due
+        """
+        try:
+            if timed:
+                return self.queue_instance.get_timed(timeout=self._timers.timeout())
+            return self.queue_instance.get(timeout=self._timers.timeout())
+        except queue.Empty:
+            return None
+
     def _thread_input(self, queue_instance, prompt, hidden):
         """This method is responsible for interruptible user input.
 
-        It is expected to be used in a thread started on demand by the App class
-        and returns the input via the communication Queue.
+        It is expected to be used in the thread of the input reader and returns
+        the input via the communication Queue.
 
         :param queue_instance: communication queue_instance to be used
         :type queue_instance: queue.Queue instance
@@ -155,11 +429,7 @@ class App(object):
         if hidden:
             data = getpass.getpass(prompt)
         else:
-            widget = TextWidget(str(prompt))
-            widget.render(self.width)
-            lines = widget.get_lines()
-            sys.stdout.write("\n".join(lines) + " ")
-            sys.stdout.flush()
+            self._write_prompt(prompt)
             # XXX: only one raw_input can run at a time, don't schedule another
             # one as it would cause weird behaviour and block other packages'
             # raw_inputs
@@ -177,6 +447,18 @@ class App(object):
 
         queue_instance.put((hubQ.HUB_CODE_INPUT, [data]))
 
+    def _write_prompt(self, prompt):
+        """Write the prompt wrapped to the screen width to the output.
+
+        :param prompt: prompt to be displayed
+        :type prompt: Prompt instance or str
+        """
+        widget = TextWidget(str(prompt))
+        widget.render(self.width)
+        lines = widget.get_lines()
+        self._output.write("\n".join(lines) + " ")
+        self._output.flush()
+
     def switch_screen(self, ui, args=None):
         """Schedules a screen to replace the current one.
 
@@ -298,8 +580,21 @@ class App(object):
         elif self._redraw:
             # get the widget tree from the screen and show it in the screen
             try:
-                input_needed = screen.refresh(args)
-                screen.show_all()
+                self._fast_forwarding = self._skip_screen(screen)
+                if not self._fast_forwarding:
+                    with self.trace("refresh", screen):
+                        input_needed = screen.refresh(args)
+                    with self.trace("show_all", screen):
+                        screen.show_all()
+                        self._output.end_frame()
+                    self._metrics.frame_shown()
+                elif screen.fast_forward_skip_refresh:
+                    self._output.skip_frame()
+                    input_needed = True
+                else:
+                    self._output.skip_frame()
+                    with self.trace("refresh", screen):
+                        input_needed = screen.refresh(args)
                 self._redraw = False
             except ExitMainLoop:
                 raise
@@ -314,6 +609,53 @@ class App(object):
 
         return input_needed
 
+    def metrics_snapshot(self):
+        """Return dictionary with the current metrics of the application.
+
+        queue_size - maximal number of messages in the queue_instance, 0 is unlimited
+        queue_depth - number of messages waiting in the queue_instance
+                      (without messages already taken by coalescing)
+        queue_high_water - the highest number of waiting messages, None if
+                           the queue_instance is not an EventQueue
+        queue_latency - event code -> count, mean and max seconds the
+                        messages waited before the dispatch (coalesced
+                        messages are not counted)
+        dropped - event code -> number of messages dropped by the overflow
+                  policy of the EventQueue
+        blocked - event code -> number of sends which waited for a free place
+        handler_time - event code -> count, mean and max seconds spent in
+                       the handlers of the event
+        input_to_frame - count, mean and max seconds from receiving the user
+                         input to showing the next frame
+        coalesced - number of messages dropped by coalescing
+        """
+        if isinstance(self.queue_instance, EventQueue):
+            snapshot = self.queue_instance.metrics()
+        else:
+            snapshot = {"queue_size": self.queue_instance.maxsize,
+                        "queue_depth": self.queue_instance.qsize(),
+                        "queue_high_water": None,
+                        "queue_latency": {},
+                        "dropped": {},
+                        "blocked": {}}
+        snapshot.update(self._metrics.snapshot())
+        return snapshot
+
+    def trace(self, phase, screen=None, detail=None):
+        """Return context manager measuring its block by the tracer.
+
+        Does nothing if the application has no tracer, see
+        simpleline.profiling.Tracer.span() for the arguments.
+        """
+        if self._tracer is None:
+            return NULL_SPAN
+        return self._tracer.span(phase, screen, detail)
+
+    def _skip_screen(self, screen):
+        """Should the screen be processed without showing it?"""
+        return (self._fast_forward and not screen.needs_attention
+                and self._input_reader.pending)
+
     def run(self):
         """This methods starts the application.
 
@@ -325,6 +667,8 @@ class App(object):
             return True
         except ExitAllMainLoops:
             return False
+        finally:
+            self._output.flush()
 
     def _mainloop(self):
         """Single mainloop. Do not use directly, start the application using run()."""
@@ -342,8 +686,8 @@ class App(object):
 
             # if redraw is needed, separate the content on the screen from the
             # stuff we are about to display now
-            if self._redraw:
-                print(self._spacer)
+            if self._redraw and not self._skip_screen(self._screens[-1][0]):
+                self._output.start_frame(self._spacer)
 
             try:
                 # draw the screen if redraw is needed or the screen changed
@@ -352,21 +696,33 @@ class App(object):
                     # we have fresh screen
 
                     # this screen is used first time (call setup() method)
-                    if not self._screens[-1][0].ready:
-                        if not self._screens[-1][0].setup(self._screens[-1][1]):
+                    screen, args, _loop = self._screens[-1]
+                    if not screen.ready:
+                        with self.trace("setup", screen):
+                            ready = screen.setup(args)
+                        if not ready:
                             # skip if setup went wrong
                             continue
                     # reset error counter
                     error_counter = 0
                     if not self._do_redraw():
-                        # if no input processing is requested, go for another cycle
+                        # if no input processing is requested, show what was
+                        # written and go for another cycle
+                        self._output.flush()
                         continue
 
                 last_screen = self._screens[-1][0]
 
+                if self._fast_forwarding and not self._skip_screen(last_screen):
+                    # the script ran out of answers (for example after an
+                    # invalid one), show the skipped screen before asking
+                    self.redraw()
+                    continue
+
                 # get the screen's prompt
                 try:
-                    prompt = last_screen.prompt(self._screens[-1][1])
+                    with self.trace("prompt", last_screen):
+                        prompt = last_screen.prompt(self._screens[-1][1])
                 except ExitMainLoop:
                     raise
                 except Exception:    # pylint: disable=broad-except
@@ -384,7 +740,9 @@ class App(object):
 
                 # process the input, if it wasn't processed (valid)
                 # increment the error counter
-                if not self.input(self._screens[-1][1], c):
+                with self.trace("input", last_screen):
+                    processed = self.input(self._screens[-1][1], c)
+                if not processed:
                     error_counter += 1
                 else:
                     # input was successfully processed, but no other screen was
@@ -420,19 +778,40 @@ class App(object):
 
         If the message does not fit return_at, but handlers are
         defined then it processes all handlers for this message
+
+        See coalesce_events() for dropping outdated messages and
+        set_event_priority() for the order of events. Timers which are due
+        are run too (see call_later()).
         """
-        while return_at or not self.queue_instance.empty():
-            event = self.queue_instance.get()
+        self._dispatch_thread = threading.get_ident()
+        self._run_timers()
+        while return_at or self._events or not self.queue_instance.empty():
+            if self._priorities and self._fetch_room() != 0:
+                # new events can go before the ones already taken
+                self._fetch_events(block=False)
+            if not self._events:
+                self._fetch_events()
+                if not self._events:
+                    # waiting ended because of a timer
+                    self._run_timers()
+                    continue
+            self._run_timers()
+            event = self._pop_event()
             if event[0] == return_at:
                 return event
             elif event[0] in self._handlers:
-                for handler, data in self._handlers[event[0]]:
-                    try:
-                        handler(event, data)
-                    except ExitMainLoop:
-                        raise
-                    except Exception:    # pylint: disable=broad-except
-                        send_exception(self.queue_instance, sys.exc_info())
+                start = time.perf_counter()
+                try:
+                    for handler, data in self._handlers[event[0]]:
+                        try:
+                            with self.trace("handler", detail=handler):
+                                handler(event, data)
+                        except ExitMainLoop:
+                            raise
+                        except Exception:    # pylint: disable=broad-except
+                            send_exception(self.queue_instance, sys.exc_info())
+                finally:
+                    self._metrics.add_handler_time(event[0], time.perf_counter() - start)
             # unhandled exception, raise it here
             elif event[0] == hubQ.HUB_CODE_EXCEPTION:
                 # raise the original exception from here
@@ -442,14 +821,22 @@ class App(object):
         """This method reads one input from user. Its basic form has only one
         line, but we might need to override it for more complex apps or testing.
         """
-        if self._input_thread is not None and self._input_thread.is_alive():
+        if self._input_pending:
             raise KeyError("Can't run multiple input threads at the same time!")
 
-        self._input_thread = threading.Thread(target=self._thread_input, name="InputThread",
-                                              args=(self.queue_instance, prompt, hidden))
-        self._input_thread.daemon = True
-        self._input_thread.start()
-        event = self.process_events(return_at=hubQ.HUB_CODE_INPUT)
+        # everything written so far has to be visible before the user is asked
+        self._output.flush()
+
+        self._input_pending = True
+        self._pending_prompt = None if hidden else prompt
+        try:
+            with self.trace("input_wait", self.current_screen):
+                self._input_reader.request(self, prompt, hidden)
+                event = self.process_events(return_at=hubQ.HUB_CODE_INPUT)
+        finally:
+            self._input_pending = False
+            self._pending_prompt = None
+        self._metrics.input_received()
         return event[1][0]  # return the user input
 
     def input(self, args, key):
@@ -503,10 +890,35 @@ class App(object):
 
         return False
 
+    @property
+    def input_pending(self):
+        """The user input is awaited."""
+        return self._input_pending
+
     def redraw(self):
         """Set the redraw flag so the screen is refreshed as soon as possible."""
         self._redraw = True
 
+    def refresh_screen(self):
+        """Show the current screen again right away.
+
+        Unlike redraw(), it does not wait until the main loop gets to it, so
+        it works from timers and event handlers also while the user input is
+        awaited. The prompt is shown again after the screen then. Long
+        widgets can't be paginated during the input, only their first page
+        is shown and the whole screen is redrawn after the input.
+        """
+        if not self._screens or self._screens[-1][2] == self.START_MAINLOOP:
+            return
+
+        self._output.start_frame(self._spacer)
+        self._redraw = True
+        self._do_redraw()
+        if self._pending_prompt is not None:
+            self._write_prompt(self._pending_prompt)
+        else:
+            self._output.flush()
+
     @property
     def header(self):
         return self._header
@@ -516,6 +928,45 @@ class App(object):
         """Return the total width of screen space we have available."""
         return self._width
 
+    @property
+    def input_reader(self):
+        """Reader used to get the user input."""
+        return self._input_reader
+
+    @property
+    def fast_forward(self):
+        """Fast-forward mode of the application.
+
+        When enabled, screens are not shown while the input reader has
+        prepared answers (see InputReader.pending). Only their refresh(),
+        prompt() and input() methods are called. Screens are shown again
+        when the answers run out or when the screen needs attention.
+        """
+        return self._fast_forward
+
+    @fast_forward.setter
+    def fast_forward(self, value):
+        self._fast_forward = value
+
+    @property
+    def fast_forwarding(self):
+        """The current screen was processed without showing it."""
+        return self._fast_forwarding
+
+    @property
+    def tracer(self):
+        """Tracer measuring the application or None."""
+        return self._tracer
+
+    @tracer.setter
+    def tracer(self, tracer):
+        self._tracer = tracer
+
+    @property
+    def output(self):
+        """Output used to show screens."""
+        return self._output
+
     @property
     def current_screen(self):
         """Get the currently visible TUI screen."""
@@ -558,6 +1009,13 @@ class UIScreen(object):
     # title line of the screen
     title = u"Screen.."
 
+    # show the screen even in the fast-forward mode of the App
+    needs_attention = False
+
+    # do not call refresh() when the screen is not shown in the fast-forward
+    # mode, set only if prompt() and input() do not depend on refresh()
+    fast_forward_skip_refresh = False
+
     def __init__(self, app, screen_height=25):
         """
         :param app: reference to application main class
@@ -605,46 +1063,94 @@ class UIScreen(object):
         """Prints a long widget (possibly longer than the screen height) with user
         interaction (when needed).
 
+        Lines of the widget are taken by pages, so long widgets producing
+        their lines lazily don't have to build all of them. The user can
+        continue to the next page, enter a number of the page to jump to,
+        /text to jump to the page with the next line containing the text or
+        ?text to the previous one. A single / or ? repeats the last search.
+
         :param widget: possibly long widget to print
         :type widget: Widget instance
         """
+        output = self.app.output
+        page_height = self._screen_height - 2
         pos = 0
-        lines = widget.get_lines()
-        num_lines = len(lines)
+        # searched text and the line of the last match
+        search = (None, None)
 
-        if num_lines < self._screen_height - 2:
-            # widget plus prompt are shorter than screen height, just print the widget
-            print(u"\n".join(lines))
-            return
-
-        # long widget, print it in steps and prompt user to continue
-        last_line = num_lines - 1
-        while pos <= last_line:
-            if pos + self._screen_height - 2 > last_line:
+        while True:
+            # one more line tells whether there is another page
+            lines = widget.get_line_range(pos, pos + page_height + 1)
+            if len(lines) <= page_height:
                 # enough space to print the rest of the widget plus regular
                 # prompt (2 lines)
-                for line in lines[pos:]:
-                    print(line)
-                pos += self._screen_height - 1
+                if lines or pos == 0:
+                    output.write_line(u"\n".join(lines))
+                return
+
+            # print part with a prompt to continue
+            output.write_line(u"\n".join(lines[:page_height]))
+            if self._app.input_pending:
+                # the screen is refreshed while the user input is awaited,
+                # show the rest of the widget when the screen is redrawn
+                self._app.redraw()
+                return
+            if widget.seekable:
+                message = _("\nPress %s to continue, enter a page number, "
+                            "/text to search forward or ?text backward")
+            else:
+                message = _("\nPress %s to continue")
+            key = self._app.raw_input(Prompt(message % Prompt.ENTER))
+            pos, search = self._pager_position(widget, pos, page_height, key, search)
+
+    def _pager_position(self, widget, pos, page_height, key, search):
+        """Return position of the next page shown by _print_long_widget and the search state."""
+        next_pos = pos + page_height
+        if not key or not widget.seekable:
+            return next_pos, search
+
+        if key.isdigit():
+            # jump to existing page, stay on the current one otherwise
+            page_pos = max(0, int(key) - 1) * page_height
+            if widget.get_line_range(page_pos, page_pos + 1):
+                return page_pos, search
+            return pos, search
+        elif key[0] in "/?":
+            backward = key[0] == "?"
+            text, last_match = search
+            if key[1:] and key[1:] != text:
+                # new search starts at the current page
+                text = key[1:]
+                last_match = pos + page_height if backward else pos - 1
+            if not text:
+                return pos, search
+
+            index = widget.line_index()
+            if backward:
+                match = index.find_previous(text, last_match)
             else:
-                # print part with a prompt to continue
-                for line in lines[pos:(pos + self._screen_height - 2)]:
-                    print(line)
-                self._app.raw_input(Prompt(_("\nPress %s to continue") % Prompt.ENTER))
-                pos += self._screen_height - 1
+                match = index.find_next(text, last_match)
+            if match is None:
+                return pos, search
+            return match - match % page_height, (text, match)
+        return next_pos, search
 
     def show_all(self):
         """Prepares all elements of self._window for output and then prints them on the screen."""
+        render_stats.begin_frame(self.app.tracer, self)
         for w in self._window:
-            if hasattr(w, "render"):
-                w.render(self.app.width)  # pylint: disable=no-member
+            if isinstance(w, Widget):
+                # renders are traced by the widgets, nested ones too
+                w.update(self.app.width)
+            elif hasattr(w, "render"):
+                with self.app.trace("render", self, w):
+                    w.render(self.app.width)  # pylint: disable=no-member
             if isinstance(w, Widget):
                 self._print_long_widget(w)
-            elif isinstance(w, bytes):
-                print(w)
             else:
                 # not a widget or string, just print its string representation
-                print(str(w))
+                self.app.output.write_line(str(w))
+        render_stats.end_frame()
 
     def input(self, args, key):
         """Method called to process input. If the input is not handled here, return it.
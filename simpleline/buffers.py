@@ -0,0 +1,163 @@
+# encoding: utf-8
+#
+# Buffer backends used by widgets of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["CharListBuffer", "RowStringBuffer"]
+
+
+class CharListBuffer(object):
+    """Widget buffer storing every row as a list of one character strings.
+
+    This is the original representation of the widget buffer. Every character
+    of the screen occupies one list slot which makes the buffer easy to modify
+    in place but expensive for large screens.
+    """
+
+    def __init__(self, default=None):
+        """
+        :param default: string containing the default content to fill the buffer with
+        :type default: str
+        """
+        self._rows = []
+        self._width = 0
+        if default:
+            self._rows = [[c for c in l] for l in default.split("\n")]
+            self._width = max(len(r) for r in self._rows)
+
+    @property
+    def rows(self):
+        """Rows of the buffer, every row is a list of one character strings."""
+        return self._rows
+
+    @property
+    def height(self):
+        """Number of rows in the buffer."""
+        return len(self._rows)
+
+    @property
+    def width(self):
+        """Length of the longest row in the buffer.
+
+        The value is kept up to date by put() and clear(), rows modified
+        directly are not taken into account.
+        """
+        return self._width
+
+    def clear(self):
+        """Remove all rows from the buffer."""
+        self._rows = []
+        self._width = 0
+
+    def put(self, row, col, text):
+        """Copy text to the row starting at the col position.
+
+        Missing rows are created and the row is filled up by spaces if it is
+        too short.
+
+        :param row: row id, starts with 0
+        :type row: int
+
+        :param col: column id, starts with 0
+        :type col: int
+
+        :param text: characters to put to the buffer
+        :type text: str or a sequence of one character strings
+        """
+        rows = self._rows
+        if row >= len(rows):
+            rows.extend([] for _i in range(row - len(rows) + 1))
+
+        line = rows[row]
+        end = col + len(text)
+        if len(line) < end:
+            line += (end - len(line)) * [u" "]
+            self._width = max(self._width, end)
+        line[col:end] = text
+
+    def get_lines(self, start=0, stop=None):
+        """Return rows from start to stop of the buffer as list of strings."""
+        return [u"".join(line) for line in self._rows[start:stop]]
+
+
+class RowStringBuffer(object):
+    """Widget buffer storing every row as one string.
+
+    Rows are immutable strings which are replaced when modified. This needs
+    only a fraction of memory compared to CharListBuffer and the rows do not
+    have to be joined again when lines of the widget are requested.
+    """
+
+    def __init__(self, default=None):
+        """
+        :param default: string containing the default content to fill the buffer with
+        :type default: str
+        """
+        self._rows = []
+        self._width = 0
+        if default:
+            self._rows = default.split("\n")
+            self._width = max(len(r) for r in self._rows)
+
+    @property
+    def rows(self):
+        """Rows of the buffer, every row is a string."""
+        return self._rows
+
+    @property
+    def height(self):
+        """Number of rows in the buffer."""
+        return len(self._rows)
+
+    @property
+    def width(self):
+        """Length of the longest row in the buffer.
+
+        The value is kept up to date by put() and clear(), rows modified
+        directly are not taken into account.
+        """
+        return self._width
+
+    def clear(self):
+        """Remove all rows from the buffer."""
+        self._rows = []
+        self._width = 0
+
+    def put(self, row, col, text):
+        """Copy text to the row starting at the col position.
+
+        See CharListBuffer.put() for details.
+        """
+        rows = self._rows
+        if row >= len(rows):
+            rows.extend(u"" for _i in range(row - len(rows) + 1))
+
+        if not isinstance(text, str):
+            text = u"".join(text)
+
+        line = rows[row]
+        end = col + len(text)
+        if len(line) < end:
+            line += (end - len(line)) * u" "
+            self._width = max(self._width, end)
+        rows[row] = line[:col] + text + line[end:]
+
+    def get_lines(self, start=0, stop=None):
+        """Return rows from start to stop of the buffer as list of strings."""
+        return self._rows[start:stop]
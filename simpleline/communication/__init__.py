@@ -16,9 +16,263 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+import time
 import queue
+import threading
+import multiprocessing
+from simpleline.metrics import LatencyStats
 from simpleline.utils import lowerASCII, upperASCII
 
+# Overflow policies of EventQueue
+# wait until there is a free place in the queue
+BLOCK = "block"
+# drop the oldest queued message of the same code
+DROP_OLDEST = "drop_oldest"
+# drop the message being sent
+DROP_NEWEST = "drop_newest"
+# replace the queued message of the same code and key
+COALESCE = "coalesce"
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, COALESCE)
+
+
+def _code(item):
+    return item[0] if isinstance(item, (tuple, list)) and item else None
+
+
+class EventQueue(queue.Queue):
+    """Queue of (code, [arguments]) messages measuring its own load.
+
+    It keeps the high-water mark of the queue depth and the time messages
+    spent in the queue per message code.
+
+    When maxsize is set, the overflow policy of the message code decides
+    what happens with messages sent to the full queue (see set_policy()).
+    Messages of critical codes and messages sent by the thread consuming
+    the queue never block, they are queued over the limit instead so the
+    consumer can't deadlock.
+    """
+
+    def __init__(self, maxsize=0, default_policy=BLOCK):
+        """
+        :param maxsize: maximal number of messages in the queue, 0 is unlimited
+        :type maxsize: int
+
+        :param default_policy: overflow policy of codes without their own policy
+        :type default_policy: one of POLICIES
+        """
+        super().__init__(maxsize)
+        if default_policy not in POLICIES:
+            raise ValueError("Unknown overflow policy %s" % default_policy)
+        self.default_policy = default_policy
+        self.critical = set()
+        self._policies = {}
+        self._consumer = None
+        # get_timed() is running, see _get()
+        self._timed = False
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self.high_water = 0
+        self._latency = {}
+        self._dropped = {}
+        self._blocked = {}
+
+    def set_policy(self, code, policy, key=None):
+        """Set the overflow policy of the message code.
+
+        :param code: message code
+        :type code: number|string
+
+        :param policy: what to do with the message when the queue is full
+        :type policy: one of POLICIES
+
+        :param key: function returning key of the message for the COALESCE
+                    policy, without it all messages of the code share one key
+        :type key: func(message)
+        """
+        if policy not in POLICIES:
+            raise ValueError("Unknown overflow policy %s" % policy)
+        self._policies[code] = (policy, key)
+
+    def put(self, item, block=True, timeout=None):
+        code = _code(item)
+        with self.not_full:
+            if 0 < self.maxsize <= self._qsize() and code not in self.critical:
+                policy, key = self._policies.get(code, (self.default_policy, None))
+                if policy == DROP_NEWEST:
+                    self._add_count(self._dropped, code)
+                    return
+                elif policy == COALESCE and self._replace(item, code, key):
+                    self._add_count(self._dropped, code)
+                    return
+                elif policy == DROP_OLDEST and self._drop_oldest(code):
+                    self._add_count(self._dropped, code)
+                elif threading.get_ident() != self._consumer:
+                    # block also when there is nothing to drop or replace
+                    self._wait_for_space(code, block, timeout)
+
+            self._put(item)
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def _wait_for_space(self, code, block, timeout):
+        if not block:
+            raise queue.Full
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+
+        self._add_count(self._blocked, code)
+        endtime = None if timeout is None else time.monotonic() + timeout
+        while self._qsize() >= self.maxsize:
+            if endtime is None:
+                self.not_full.wait()
+            else:
+                remaining = endtime - time.monotonic()
+                if remaining <= 0.0:
+                    raise queue.Full
+                self.not_full.wait(remaining)
+
+    def _drop_oldest(self, code):
+        for i, (_enqueued, item) in enumerate(self.queue):
+            if _code(item) == code:
+                del self.queue[i]
+                self.unfinished_tasks -= 1
+                return True
+        return False
+
+    def _replace(self, new_item, code, key):
+        new_key = key(new_item) if key else None
+        for i in range(len(self.queue) - 1, -1, -1):
+            enqueued, item = self.queue[i]
+            if _code(item) == code and (key(item) if key else None) == new_key:
+                self.queue[i] = (enqueued, new_item)
+                return True
+        return False
+
+    @staticmethod
+    def _add_count(counters, code):
+        counters[code] = counters.get(code, 0) + 1
+
+    def _put(self, item):
+        self.queue.append((time.perf_counter(), item))
+        if len(self.queue) > self.high_water:
+            self.high_water = len(self.queue)
+
+    def _get(self):
+        self._consumer = threading.get_ident()
+        enqueued, item = self.queue.popleft()
+        if self._timed:
+            return enqueued, item
+
+        self._add_latency(_code(item), time.perf_counter() - enqueued)
+        return item
+
+    def get_timed(self, block=True, timeout=None):
+        """Remove and return the message with the time it was sent.
+
+        The latency of the message is not measured, the consumer dispatching
+        messages later than it takes them from the queue measures it by
+        add_latency() when the message is dispatched. Arguments are the same
+        as for get().
+
+        :return: time.perf_counter() of the send and the message
+        :rtype: (float, message)
+        """
+        # only the consumer thread takes messages from the queue
+        self._timed = True
+        try:
+            return self.get(block, timeout)
+        finally:
+            self._timed = False
+
+    def add_latency(self, code, seconds):
+        """Measure the latency of a message taken by get_timed().
+
+        :param code: message code
+        :type code: number|string
+
+        :param seconds: time from sending the message to its dispatch
+        :type seconds: float
+        """
+        with self.mutex:
+            self._add_latency(code, seconds)
+
+    def _add_latency(self, code, seconds):
+        stats = self._latency.get(code)
+        if stats is None:
+            stats = self._latency[code] = LatencyStats()
+        stats.add(seconds)
+
+    def metrics(self):
+        """Return dictionary with the queue metrics.
+
+        queue_size - maximal number of messages, 0 is unlimited
+        queue_depth - number of messages in the queue
+        queue_high_water - the highest number of messages in the queue
+        queue_latency - code -> count, mean and max seconds from the send
+                        until the message was taken from the queue, or
+                        dispatched for messages taken by get_timed()
+        dropped - code -> number of messages dropped or replaced because
+                  the queue was full
+        blocked - code -> number of sends which waited because the queue
+                  was full
+        """
+        with self.mutex:
+            return {"queue_size": self.maxsize,
+                    "queue_depth": len(self.queue),
+                    "queue_high_water": self.high_water,
+                    "queue_latency": {code: stats.snapshot()
+                                      for code, stats in self._latency.items()},
+                    "dropped": dict(self._dropped),
+                    "blocked": dict(self._blocked)}
+
+    def reset_metrics(self):
+        """Start measuring again, the high-water mark is set to the current depth."""
+        with self.mutex:
+            self.high_water = len(self.queue)
+            self._latency = {}
+            self._dropped = {}
+            self._blocked = {}
+
+
+class ProcessBridge(object):
+    """Forward messages sent from other processes to a local queue.
+
+    Other processes put messages to the remote multiprocessing queue, a
+    thread of this process moves them to the target queue where they are
+    processed as any other message.
+    """
+
+    def __init__(self, target, context=None):
+        """
+        :param target: queue receiving the messages
+        :type target: queue.Queue instance
+
+        :param context: multiprocessing context creating the remote queue
+        :type context: multiprocessing context (default context if None)
+        """
+        self.target = target
+        self.remote = (context or multiprocessing.get_context()).Queue()
+        self._thread = threading.Thread(target=self._forward, name="ProcessBridge")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _forward(self):
+        while True:
+            message = self.remote.get()
+            if message is None:
+                return
+            self.target.put(message)
+
+    def close(self):
+        """Forward messages sent so far and stop."""
+        self.remote.put(None)
+        self._thread.join()
+        self.remote.close()
+        self.remote.join_thread()
+
 
 class QueueFactory(object):
     """Constructs a new object wrapping a Queue.Queue, complete with constants
@@ -40,15 +294,71 @@ class QueueFactory(object):
        that takes one argument.
 
        Reusing names within the same class is not allowed.
+
+       The queue is unbounded by default. With maxsize the messages sent to
+       the full queue are handled by the overflow policy given to addMessage
+       (see EventQueue.set_policy).
+
+       Messages can be sent from other processes too, after the transport
+       is started by:
+
+           remote = q.start_process_transport()
+
+       Processes forked after that send the messages by the same send_*
+       methods. Spawned processes have to call q.attach_process_transport(remote)
+       first, for example from the initializer of the process pool.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, maxsize=0, default_policy=BLOCK):
         self.name = name
 
         self.__counter = 0
         self.__names = []
 
-        self.q = queue.Queue()
+        self.q = EventQueue(maxsize, default_policy)
+
+        # transport from other processes
+        self._bridge = None
+        self._owner_pid = None
+        self._remote = None
+
+    def start_process_transport(self, context=None):
+        """Accept messages sent from other processes.
+
+        :param context: multiprocessing context of the processes
+        :type context: multiprocessing context (default context if None)
+
+        :return: queue to pass to attach_process_transport() in spawned processes
+        :rtype: multiprocessing.Queue instance
+        """
+        if self._bridge is None:
+            self._bridge = ProcessBridge(self.q, context)
+            self._owner_pid = os.getpid()
+        return self._bridge.remote
+
+    def stop_process_transport(self):
+        """Forward messages sent by other processes so far and stop."""
+        if self._bridge is not None:
+            self._bridge.close()
+            self._bridge = None
+            self._owner_pid = None
+
+    def attach_process_transport(self, remote):
+        """Send messages of this process to the process which started the transport.
+
+        :param remote: queue returned by start_process_transport()
+        :type remote: multiprocessing.Queue instance
+        """
+        self._remote = remote
+
+    def _process_queue(self):
+        """Return the remote queue when sending from another process."""
+        if self._remote is not None:
+            return self._remote
+        if self._bridge is not None and os.getpid() != self._owner_pid:
+            # forked process
+            return self._bridge.remote
+        return None
 
     def _makeMethod(self, constant, methodName, argc):
         def __method(*args):
@@ -56,12 +366,33 @@ class QueueFactory(object):
                 raise TypeError("%s() takes exactly %d arguments (%d given)" %
                                 (methodName, argc, len(args)))
 
-            self.q.put((constant, args))
+            remote = self._process_queue()
+            if remote is None:
+                self.q.put((constant, args))
+            else:
+                remote.put((constant, args))
 
         __method.__name__ = methodName
         return __method
 
-    def addMessage(self, name, argc):
+    def addMessage(self, name, argc, policy=None, key=None, critical=False):
+        """Add a new message type.
+
+        :param name: name of the message
+        :type name: str
+
+        :param argc: number of arguments of the message
+        :type argc: int
+
+        :param policy: overflow policy of the message (default policy of the queue if None)
+        :type policy: one of POLICIES
+
+        :param key: key function for the COALESCE policy
+        :type key: func(message)
+
+        :param critical: the message is never dropped or blocked
+        :type critical: bool
+        """
         if name in self.__names:
             raise AttributeError("%s queue already has a message named %s" % (self.name, name))
 
@@ -75,4 +406,10 @@ class QueueFactory(object):
         method = self._makeMethod(getattr(self, const_name), method_name, argc)
         setattr(self, method_name, method)
 
+        constant = getattr(self, const_name)
+        if policy is not None:
+            self.q.set_policy(constant, policy, key)
+        if critical:
+            self.q.critical.add(constant)
+
         self.__names.append(name)
@@ -16,7 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from simpleline.communication import QueueFactory
+from simpleline.communication import QueueFactory, COALESCE
 
 # A queue to be used for communicating information from a spoke back to its
 # hub.  This information includes things like marking spokes as ready and
@@ -28,11 +28,41 @@ from simpleline.communication import QueueFactory
 # Arguments vary based on the code given, but the first argument must always
 # be the name of the class of the spoke to be acted upon.  See below for more
 # details.
+#
+# The queue is unbounded, set hubQ.q.maxsize to limit it. Status messages of
+# a spoke then replace the older ones when the queue is full.
 hubQ = QueueFactory("hub")
 
 hubQ.addMessage("ready", 2)        # spoke_name, justUpdate
 hubQ.addMessage("not_ready", 1)    # spoke_name
-hubQ.addMessage("message", 2)      # spoke_name, string
-hubQ.addMessage("input", 1)        # string
-hubQ.addMessage("exception", 1)    # exception
+hubQ.addMessage("message", 2,      # spoke_name, string
+                policy=COALESCE, key=lambda message: message[1][0])
+hubQ.addMessage("input", 1, critical=True)      # string
+hubQ.addMessage("exception", 1, critical=True)  # exception
 hubQ.addMessage("show_message", 3) # show_message_function, args, result_queue
+
+
+def attach_hub_queue(remote):
+    """Send hubQ messages of this process to the process running the App.
+
+    Can be used as an initializer of spawned processes:
+
+        remote = hubQ.start_process_transport()
+        pool = multiprocessing.Pool(initializer=attach_hub_queue, initargs=(remote,))
+
+    :param remote: queue returned by hubQ.start_process_transport()
+    :type remote: multiprocessing.Queue instance
+    """
+    hubQ.attach_process_transport(remote)
+
+
+# Priorities of hub events for App(event_priorities=HUB_PRIORITIES), the user
+# input and errors are dispatched before status updates of spokes.
+HUB_PRIORITIES = {
+    hubQ.HUB_CODE_INPUT: 0,
+    hubQ.HUB_CODE_EXCEPTION: 0,
+    hubQ.HUB_CODE_SHOW_MESSAGE: 0,
+    hubQ.HUB_CODE_READY: 2,
+    hubQ.HUB_CODE_NOT_READY: 2,
+    hubQ.HUB_CODE_MESSAGE: 2,
+}
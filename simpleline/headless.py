@@ -0,0 +1,257 @@
+# Headless run of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["ScriptExhausted", "ScriptedInput", "FrameCapture", "HeadlessDriver"]
+
+import time
+from collections import deque
+from simpleline.base import App, ExitAllMainLoops
+from simpleline.communication.communication import hubQ
+from simpleline.input import InputReader
+from simpleline.output import OutputSink
+
+
+class ScriptExhausted(ExitAllMainLoops):
+    """Input was requested but the script has no more answers.
+
+    Ends the application, App.run() returns False.
+    """
+    pass
+
+
+class ScriptedInput(InputReader):
+    """Input reader answering prompts from a prepared script.
+
+    Answers are delivered right away as HUB_CODE_INPUT messages without
+    any thread. When the script runs dry, the fallback reader is asked
+    instead, without the fallback the application ends.
+    """
+
+    def __init__(self, answers, show_prompt=True, fallback=None):
+        """
+        :param answers: answers to the prompts in order
+        :type answers: iterable of str
+
+        :param show_prompt: write prompts to the App output
+        :type show_prompt: bool
+
+        :param fallback: reader used when the script has no more answers
+        :type fallback: instance of InputReader
+        """
+        self._answers = iter(answers)
+        self._next = deque()
+        self._show_prompt = show_prompt
+        self._fallback = fallback
+        self._used = 0
+
+    @classmethod
+    def from_file(cls, path, show_prompt=True, fallback=None):
+        """Read answers from the file, one answer per line.
+
+        :param path: path to the file
+        :type path: str
+        """
+        def lines():
+            with open(path, "r") as f:
+                for line in f:
+                    yield line.rstrip("\n")
+
+        return cls(lines(), show_prompt, fallback)
+
+    @property
+    def pending(self):
+        """Does the script have more answers?"""
+        if not self._next:
+            for answer in self._answers:
+                self._next.append(answer)
+                break
+        return bool(self._next)
+
+    @property
+    def used(self):
+        """Number of answers returned."""
+        return self._used
+
+    def request(self, app, prompt, hidden):
+        if not self.pending:
+            if self._fallback is None:
+                raise ScriptExhausted()
+            self._fallback.request(app, prompt, hidden)
+            return
+
+        # prompt of the screen which was not shown is not shown either
+        if self._show_prompt and not hidden and not app.fast_forwarding:
+            app._write_prompt(prompt)  # pylint: disable=protected-access
+
+        self._used += 1
+        app.queue_instance.put((hubQ.HUB_CODE_INPUT, [self._next.popleft()]))
+
+    def close(self):
+        if self._fallback is not None:
+            self._fallback.close()
+
+
+class FrameCapture(OutputSink):
+    """Output storing frames in memory.
+
+    Every frame is a list of lines, the text written outside of frames
+    (prompts) is appended to the last frame. The time between starts of
+    frames is accounted to the screen shown in the frame. Screens skipped
+    in the fast-forward mode of the App are timed as frames without lines.
+    """
+
+    def __init__(self, keep_frames=None, app=None):
+        """
+        :param keep_frames: keep only this number of the last frames (all if None)
+        :type keep_frames: int
+
+        :param app: application whose screens are timed, set by HeadlessDriver
+        :type app: instance of App
+        """
+        super().__init__()
+        self.app = app
+        self.frames = deque(maxlen=keep_frames)
+        self.frame_count = 0
+        # screen class name -> [frames, seconds]
+        self.screen_times = {}
+        self._text = []
+        self._frame_start = None
+        self._frame_screen = None
+
+    def start_frame(self, separator):
+        self._account()
+        self._frame_start = time.perf_counter()
+        self._frame_screen = None
+        self._text = []
+        self.frames.append(self._text)
+        self.frame_count += 1
+
+    def end_frame(self):
+        self._frame_screen = self._current_screen()
+
+    def skip_frame(self):
+        # the time of the skipped screen is not accounted to the previous frame
+        self._account()
+        self._frame_start = time.perf_counter()
+        self._frame_screen = self._current_screen()
+
+    def _current_screen(self):
+        if self.app is not None and self.app.current_screen is not None:
+            return type(self.app.current_screen).__name__
+        return None
+
+    def write(self, text):
+        self._text.append(text)
+
+    def flush(self):
+        pass
+
+    def finish(self):
+        """Account the time of the last frame."""
+        self._account()
+        self._frame_start = None
+
+    def get_lines(self, frame=-1):
+        """Return lines of the captured frame.
+
+        :param frame: index of the frame
+        :type frame: int
+        """
+        return u"".join(self.frames[frame]).split(u"\n")
+
+    def _account(self):
+        if self._frame_start is None:
+            return
+
+        times = self.screen_times.setdefault(self._frame_screen, [0, 0.0])
+        times[0] += 1
+        times[1] += time.perf_counter() - self._frame_start
+
+
+class HeadlessDriver(object):
+    """Run applications with scripted input and captured output.
+
+    Example:
+
+        driver = HeadlessDriver(["1", "John", "c"])
+        app = driver.create_app("Test")
+        app.schedule_screen(Hub(app))
+        driver.run()
+        print(driver.report())
+    """
+
+    def __init__(self, answers, keep_frames=1, show_prompt=True):
+        """
+        :param answers: answers to the prompts in order
+        :type answers: iterable of str or ScriptedInput instance
+
+        :param keep_frames: number of the last frames kept in memory
+        :type keep_frames: int
+
+        :param show_prompt: render prompts to the captured output
+        :type show_prompt: bool
+        """
+        if isinstance(answers, ScriptedInput):
+            self.input = answers
+        else:
+            self.input = ScriptedInput(answers, show_prompt)
+        self.output = FrameCapture(keep_frames)
+        self.app = None
+        self.elapsed = 0.0
+
+    def create_app(self, *args, app_class=App, **kwargs):
+        """Create application using the scripted input and captured output.
+
+        Arguments are passed to the app_class.
+        """
+        self.app = app_class(*args, output=self.output, input_reader=self.input, **kwargs)
+        self.output.app = self.app
+        return self.app
+
+    def run(self):
+        """Run the application.
+
+        :return: result of App.run()
+        """
+        start = time.perf_counter()
+        try:
+            return self.app.run()
+        finally:
+            self.output.finish()
+            self.elapsed += time.perf_counter() - start
+
+    @property
+    def frames(self):
+        """Total number of frames rendered."""
+        return self.output.frame_count
+
+    @property
+    def screen_times(self):
+        """Dictionary of screen class name -> (frames, seconds)."""
+        return {name: tuple(times) for name, times in self.output.screen_times.items()}
+
+    def report(self):
+        """Return a table with the timing of screens."""
+        lines = ["%-30s %8s %12s %12s" % ("screen", "frames", "total [ms]", "frame [ms]")]
+        for name, (frames, seconds) in sorted(self.screen_times.items(),
+                                              key=lambda item: -item[1][1]):
+            lines.append("%-30s %8d %12.3f %12.3f" % (name, frames, seconds * 1000,
+                                                      seconds * 1000 / frames))
+        lines.append("%-30s %8d %12.3f" % ("total", self.frames, self.elapsed * 1000))
+        return "\n".join(lines)
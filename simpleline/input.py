@@ -0,0 +1,97 @@
+# Input readers for the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["InputReader", "ThreadInputReader"]
+
+import queue
+import threading
+
+
+class InputReader(object):
+    """Base class for the App input.
+
+    The reader is asked for the input by request() and it has to deliver
+    the input as the HUB_CODE_INPUT message to the App.queue_instance
+    (App._thread_input() does exactly that).
+    """
+
+    @property
+    def pending(self):
+        """Are answers available without waiting for the user?
+
+        Readers of prepared answers return True so the App can skip showing
+        screens in the fast-forward mode.
+        """
+        return False
+
+    def request(self, app, prompt, hidden):
+        """Request one input from the user.
+
+        :param app: application asking for the input
+        :type app: instance of App
+
+        :param prompt: prompt to be displayed
+        :type prompt: Prompt instance or str
+
+        :param hidden: whether typed characters should be echoed or not
+        :type hidden: bool
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Release resources of the reader."""
+        pass
+
+
+class ThreadInputReader(InputReader):
+    """Input reader with one long-lived thread serving all requests.
+
+    The thread is started on the first request and then waits for next
+    requests, so no thread is created for each prompt.
+    """
+
+    def __init__(self):
+        self._requests = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def request(self, app, prompt, hidden):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="InputThread")
+                self._thread.daemon = True
+                self._thread.start()
+
+        self._requests.put((app, prompt, hidden))
+
+    def close(self):
+        """Stop the thread after the current request is finished."""
+        with self._lock:
+            if self._thread is not None:
+                self._requests.put(None)
+                self._thread = None
+
+    def _run(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            app, prompt, hidden = request
+            app._thread_input(app.queue_instance, prompt, hidden)  # pylint: disable=protected-access
@@ -0,0 +1,156 @@
+# Runtime metrics of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["LatencyStats", "AppMetrics", "MetricsLogger"]
+
+import time
+import logging
+import threading
+
+log = logging.getLogger("simpleline")
+
+
+class LatencyStats(object):
+    """Count, total and maximum of measured durations."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def snapshot(self):
+        """Return the values as a dictionary, times are in seconds."""
+        return {"count": self.count, "mean": self.mean, "max": self.max}
+
+
+class AppMetrics(object):
+    """Metrics measured by the App itself.
+
+    Time spent in event handlers per event code, the time between
+    receiving the user input and showing the next frame and the number of
+    coalesced messages.
+    """
+
+    def __init__(self):
+        self.handler_time = {}
+        self.coalesced = 0
+        self.input_to_frame = LatencyStats()
+        self._input_time = None
+
+    def add_handler_time(self, code, seconds):
+        stats = self.handler_time.get(code)
+        if stats is None:
+            stats = self.handler_time[code] = LatencyStats()
+        stats.add(seconds)
+
+    def input_received(self):
+        """User input was received, wait for the next frame."""
+        self._input_time = time.perf_counter()
+
+    def frame_shown(self):
+        """A frame was shown, measure it if it follows the user input."""
+        if self._input_time is not None:
+            self.input_to_frame.add(time.perf_counter() - self._input_time)
+            self._input_time = None
+
+    def snapshot(self):
+        return {"handler_time": {code: stats.snapshot()
+                                 for code, stats in dict(self.handler_time).items()},
+                "input_to_frame": self.input_to_frame.snapshot(),
+                "coalesced": self.coalesced}
+
+
+class MetricsLogger(object):
+    """Periodically log metrics of the App to the "simpleline" logger.
+
+    Example:
+
+        metrics_logger = MetricsLogger(app, interval=30)
+        metrics_logger.start()
+        app.run()
+        metrics_logger.stop()
+    """
+
+    def __init__(self, app, interval=60, level=logging.INFO):
+        """
+        :param app: application to log metrics of
+        :type app: instance of App
+
+        :param interval: seconds between two log messages
+        :type interval: float
+
+        :param level: logging level of the messages
+        :type level: int
+        """
+        self._app = app
+        self._interval = interval
+        self._level = level
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start logging in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="MetricsLogger")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        """Stop logging and wait for the thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self._interval):
+            self.log()
+
+    def log(self):
+        """Log the current metrics."""
+        if log.isEnabledFor(self._level):
+            log.log(self._level, "%s", self.format(self._app.metrics_snapshot()))
+
+    @staticmethod
+    def format(snapshot):
+        """Return the metrics snapshot as one line of text."""
+        parts = ["queue depth %s (max %s)" % (snapshot["queue_depth"],
+                                               snapshot["queue_high_water"])]
+        for name in ("queue_latency", "handler_time"):
+            for code, stats in sorted(snapshot[name].items(), key=lambda item: str(item[0])):
+                parts.append("%s[%s] %d x %.3f ms (max %.3f ms)" % (
+                    name, code, stats["count"], stats["mean"] * 1000, stats["max"] * 1000))
+
+        stats = snapshot["input_to_frame"]
+        parts.append("input_to_frame %d x %.3f ms (max %.3f ms)" % (
+            stats["count"], stats["mean"] * 1000, stats["max"] * 1000))
+        parts.append("coalesced %d" % snapshot["coalesced"])
+        parts.append("dropped %d" % sum(snapshot["dropped"].values()))
+        parts.append("blocked %d" % sum(snapshot["blocked"].values()))
+        return ", ".join(parts)
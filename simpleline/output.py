@@ -0,0 +1,341 @@
+# Output of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["OutputSink", "LineOutput", "BufferedOutput", "AnsiOutput"]
+
+import os
+import sys
+import shutil
+import threading
+
+
+class OutputSink(object):
+    """Base class for the App output.
+
+    The App starts every redraw of the screen by start_frame(), screens write
+    their content by write_line() and the frame is finished by end_frame().
+    Everything written has to be visible after flush() which is called before
+    user input is requested.
+    """
+
+    def __init__(self, stream=None):
+        """
+        :param stream: stream to write to, sys.stdout is used when not specified
+        :type stream: file object
+        """
+        self._stream = stream
+
+    @property
+    def stream(self):
+        """Stream the output is written to.
+
+        The sys.stdout is looked up on every use so it can be replaced.
+        """
+        return self._stream or sys.stdout
+
+    def start_frame(self, separator):
+        """Start a new frame.
+
+        :param separator: text separating the new frame from the previous output
+        :type separator: str
+        """
+        self.write_line(separator)
+
+    def end_frame(self):
+        """The whole frame was written."""
+        pass
+
+    def skip_frame(self):
+        """The current screen was processed without showing it (fast-forward mode of the App)."""
+        pass
+
+    def write_line(self, line=u""):
+        """Write one line of the output.
+
+        :param line: line without the trailing newline
+        :type line: str
+        """
+        self.write(line + u"\n")
+
+    def write(self, text):
+        """Write text to the output.
+
+        :param text: text to write
+        :type text: str
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Make everything written visible."""
+        self.stream.flush()
+
+
+class LineOutput(OutputSink):
+    """Output writing every line to the stream right away."""
+
+    def write(self, text):
+        self.stream.write(text)
+
+
+class BufferedOutput(OutputSink):
+    """Output assembling the text in a buffer and writing it at once.
+
+    The buffer is written by one write call when flushed, so a whole frame
+    together with the prompt is sent in one system call.
+    """
+
+    def __init__(self, stream=None, encoding=None, flush_threshold=None):
+        """
+        :param stream: stream to write to, sys.stdout is used when not specified
+        :type stream: file object
+
+        :param encoding: if specified, the buffer is encoded and written as bytes
+                         to the binary buffer of the stream (or the stream itself
+                         if it does not have one)
+        :type encoding: str
+
+        :param flush_threshold: flush the buffer when it grows over this number
+                                of characters
+        :type flush_threshold: int
+        """
+        super().__init__(stream)
+        self._encoding = encoding
+        self._flush_threshold = flush_threshold
+        self._parts = []
+        self._size = 0
+        # prompt is written from the input thread
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self):
+        """Number of characters waiting in the buffer."""
+        return self._size
+
+    def write(self, text):
+        with self._lock:
+            self._parts.append(text)
+            self._size += len(text)
+            over_threshold = self._flush_threshold and self._size >= self._flush_threshold
+
+        if over_threshold:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            data = u"".join(self._parts)
+            self._parts = []
+            self._size = 0
+
+        stream = self.stream
+        if data and self._encoding:
+            # text written to the stream by others has to go out first
+            stream.flush()
+            stream = getattr(stream, "buffer", stream)
+            stream.write(data.encode(self._encoding))
+        elif data:
+            stream.write(data)
+        stream.flush()
+
+
+class AnsiOutput(BufferedOutput):
+    """Output repainting only the lines which changed since the previous frame.
+
+    Every frame is drawn from the top left corner of the terminal. Lines
+    which are the same as in the previous frame are kept on the screen and
+    the changed ones are overwritten by cursor addressed ANSI sequences.
+
+    Frames which do not fit to the terminal, frames with lines wrapped by
+    the terminal and frames interrupted by a prompt (long widgets) are
+    repainted as a whole. Terminals without ANSI
+    support get the same append-only output as BufferedOutput.
+    """
+
+    CLEAR_SCREEN = u"\x1b[H\x1b[2J"
+    CLEAR_LINE = u"\x1b[K"
+    CLEAR_BELOW = u"\x1b[J"
+    MOVE_TO = u"\x1b[%d;1H"
+
+    def __init__(self, stream=None, encoding=None, flush_threshold=None, enabled=None,
+                 height=None, width=None):
+        """
+        :param stream: stream to write to, sys.stdout is used when not specified
+        :type stream: file object
+
+        :param encoding: see BufferedOutput
+        :type encoding: str
+
+        :param flush_threshold: see BufferedOutput
+        :type flush_threshold: int
+
+        :param enabled: use ANSI sequences, autodetected from the stream and
+                        the TERM environment variable when not specified
+        :type enabled: bool
+
+        :param height: height of the terminal, detected when not specified
+        :type height: int
+
+        :param width: width of the terminal, detected when not specified
+        :type width: int
+        """
+        super().__init__(stream, encoding, flush_threshold)
+        if enabled is None:
+            enabled = self.is_supported(self.stream)
+        self._enabled = enabled
+        self._height = height
+        self._width = width
+        # lines of the frame being written and of the frame on the screen
+        self._frame = None
+        self._previous = None
+        # terminal rows and the column of the cursor below the frame on the
+        # screen, written by prompts and the user input
+        self._rows_below = 0
+        self._column = 0
+
+    @staticmethod
+    def is_supported(stream):
+        """Is the stream a terminal understanding ANSI sequences?"""
+        if os.environ.get("TERM", "dumb") == "dumb":
+            return False
+        try:
+            return stream.isatty()
+        except (AttributeError, ValueError):
+            return False
+
+    @property
+    def enabled(self):
+        """Are the frames repainted by ANSI sequences?"""
+        return self._enabled
+
+    @property
+    def height(self):
+        """Height of the terminal."""
+        return self._height or shutil.get_terminal_size().lines
+
+    @property
+    def width(self):
+        """Width of the terminal."""
+        return self._width or shutil.get_terminal_size().columns
+
+    def start_frame(self, separator):
+        if not self._enabled:
+            super().start_frame(separator)
+            return
+
+        # unfinished frame is replaced by the new one
+        self._frame = []
+
+    def write_line(self, line=u""):
+        if self._frame is None:
+            super().write_line(line)
+        else:
+            self._frame.extend(line.split(u"\n"))
+
+    def end_frame(self):
+        if self._frame is None:
+            return
+
+        frame = self._frame
+        self._frame = None
+
+        # the previous frame can be addressed only if its prompts and the
+        # user input did not scroll the screen, the new frame plus at least
+        # one line of the prompt and the input have to fit too and every
+        # line has to take one row of the terminal
+        if (self._previous is None or len(self._previous) + self._used_rows() > self.height
+                or len(frame) + 2 > self.height or self._wraps(frame)):
+            self._repaint(frame)
+            return
+
+        parts = []
+        for row, line in enumerate(frame):
+            if row >= len(self._previous) or line != self._previous[row]:
+                parts.append(self.MOVE_TO % (row + 1) + line + self.CLEAR_LINE)
+
+        # remove the rest of the previous frame, prompt and the user input
+        parts.append(self.MOVE_TO % (len(frame) + 1) + self.CLEAR_BELOW)
+        self.write(u"".join(parts))
+        self._set_previous(frame)
+
+    def write(self, text):
+        self._interrupt_frame()
+        super().write(text)
+        if self._previous is not None:
+            self._count_rows(text)
+
+    def _count_rows(self, text):
+        """Count terminal rows written below the frame on the screen."""
+        if self._column:
+            # text after a prompt follows the user input ended by a newline
+            self._rows_below += 1
+            self._column = 0
+
+        width = self.width
+        for i, line in enumerate(text.split(u"\n")):
+            if i:
+                self._rows_below += 1
+                self._column = 0
+            self._column += len(line)
+            # the terminal wraps before a character beyond the last column
+            while self._column > width:
+                self._rows_below += 1
+                self._column -= width
+
+    def _wraps(self, frame):
+        """Does any line of the frame take more than one row of the terminal?"""
+        width = self.width
+        return any(len(line) > width for line in frame)
+
+    def _used_rows(self):
+        """Return rows of the terminal taken by the previous frame after its lines."""
+        # the row of the cursor and the newline ending the user input
+        return self._rows_below + 2
+
+    def _set_previous(self, frame):
+        self._previous = frame
+        self._rows_below = 0
+        self._column = 0
+
+    def flush(self):
+        self._interrupt_frame()
+        super().flush()
+
+    def invalidate(self):
+        """Repaint the whole next frame.
+
+        Should be called when something else wrote to the terminal.
+        """
+        self._previous = None
+
+    def _interrupt_frame(self):
+        if self._frame is not None:
+            # frame is interrupted by a prompt, show what we have and continue
+            # in the append-only mode
+            frame = self._frame
+            self._frame = None
+            self._repaint(frame)
+            self._previous = None
+
+    def _repaint(self, frame):
+        self.write(self.CLEAR_SCREEN + u"".join(line + u"\n" for line in frame))
+        if len(frame) + 2 > self.height or self._wraps(frame):
+            # the frame is scrolled or its lines are wrapped, rows of the
+            # lines can't be addressed
+            self._previous = None
+        else:
+            self._set_previous(frame)
@@ -0,0 +1,187 @@
+# Profiling of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["Tracer", "TraceRecord", "NULL_SPAN"]
+
+import os
+import json
+import time
+import threading
+from collections import deque, namedtuple
+
+# One measured span
+#  phase - what was done (setup, refresh, render, show_all, prompt, input,
+#          input_wait, handler)
+#  screen - class name of the screen or None
+#  detail - widget type, handler name or None
+#  start - time.perf_counter() value when the span started
+#  duration - length of the span in seconds
+#  thread - identifier of the thread
+TraceRecord = namedtuple("TraceRecord", ["phase", "screen", "detail", "start", "duration",
+                                         "thread"])
+
+
+def _name(obj):
+    if obj is None or isinstance(obj, str):
+        return obj
+    # functions and methods are named by themselves, other objects by their type
+    return getattr(obj, "__qualname__", None) or type(obj).__name__
+
+
+class _NullSpan(object):
+    """Span doing nothing, used when the App has no tracer."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span(object):
+
+    def __init__(self, tracer, phase, screen, detail):
+        self._tracer = tracer
+        self._phase = phase
+        self._screen = screen
+        self._detail = detail
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = time.perf_counter() - self._start
+        self._tracer.add(TraceRecord(self._phase, _name(self._screen), _name(self._detail),
+                                     self._start, duration, threading.get_ident()))
+        return False
+
+
+class Tracer(object):
+    """Recorder of the time spent in the parts of the App.
+
+    Set it to the App by App(tracer=Tracer()) or by the App.tracer property.
+    The App then measures setup, refresh, show_all, prompt and input of
+    screens, every widget render in show_all (widgets rendered by other
+    widgets too, their spans are included in the parent span), waiting for
+    the user input and every event handler called by process_events.
+
+    Callbacks added by add_hook() get every TraceRecord when it is measured.
+    """
+
+    def __init__(self, max_records=None):
+        """
+        :param max_records: keep only this number of the last records (all if None)
+        :type max_records: int
+        """
+        self.records = deque(maxlen=max_records)
+        self._hooks = []
+        self._origin = time.perf_counter()
+
+    def add_hook(self, callback):
+        """Call the callback with every new TraceRecord.
+
+        :param callback: the callback function
+        :type callback: func(record)
+        """
+        self._hooks.append(callback)
+
+    def remove_hook(self, callback):
+        self._hooks.remove(callback)
+
+    def span(self, phase, screen=None, detail=None):
+        """Return context manager measuring its block.
+
+        :param phase: name of the measured action
+        :type phase: str
+
+        :param screen: screen the action belongs to
+        :type screen: UIScreen instance or str
+
+        :param detail: widget or other detail of the action
+        :type detail: object or str
+        """
+        return _Span(self, phase, screen, detail)
+
+    def add(self, record):
+        """Store the measured record and pass it to the hooks."""
+        self.records.append(record)
+        for hook in self._hooks:
+            hook(record)
+
+    def clear(self):
+        """Remove all records."""
+        self.records.clear()
+
+    def stats(self):
+        """Return dictionary (phase, screen, detail) -> (count, total, max)."""
+        stats = {}
+        for record in list(self.records):
+            key = (record.phase, record.screen, record.detail)
+            count, total, longest = stats.get(key, (0, 0.0, 0.0))
+            stats[key] = (count + 1, total + record.duration, max(longest, record.duration))
+        return stats
+
+    def summary(self):
+        """Return a table of the spans grouped by phase, screen and detail.
+
+        Rows are sorted by the total time, times are in milliseconds.
+        """
+        lines = ["%-12s %-24s %-30s %8s %12s %10s %10s" % (
+            "phase", "screen", "detail", "count", "total", "mean", "max")]
+        for (phase, screen, detail), (count, total, longest) in sorted(
+                self.stats().items(), key=lambda item: -item[1][1]):
+            lines.append("%-12s %-24s %-30s %8d %12.3f %10.3f %10.3f" % (
+                phase, screen or "", detail or "", count, total * 1000,
+                total * 1000 / count, longest * 1000))
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Return the records in the Chrome trace event format.
+
+        The result can be loaded to chrome://tracing or Perfetto.
+        """
+        pid = os.getpid()
+        events = []
+        for record in list(self.records):
+            name = record.phase
+            if record.detail:
+                name += " " + record.detail
+            events.append({"name": name,
+                           "cat": record.phase,
+                           "ph": "X",
+                           "ts": (record.start - self._origin) * 1e6,
+                           "dur": record.duration * 1e6,
+                           "pid": pid,
+                           "tid": record.thread,
+                           "args": {"screen": record.screen, "detail": record.detail}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path):
+        """Write the Chrome trace JSON to the file.
+
+        :param path: path to the file
+        :type path: str
+        """
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,127 @@
+# Timers of the Text UI framework.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["TimerHandle", "Timers"]
+
+import time
+import heapq
+import itertools
+import threading
+
+
+class TimerHandle(object):
+    """Scheduled call returned by App.call_later() and App.call_every()."""
+
+    def __init__(self, when, interval, callback, args):
+        """
+        :param when: time.monotonic() value when the callback should be called
+        :type when: float
+
+        :param interval: seconds between calls of a repeated timer, None for one call
+        :type interval: float
+
+        :param callback: function to call
+        :type callback: func(*args)
+
+        :param args: arguments of the callback
+        :type args: tuple
+        """
+        self.when = when
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+        self._cancelled = False
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """Do not call the callback anymore."""
+        self._cancelled = True
+
+
+class Timers(object):
+    """Heap of timers ordered by the time of their next call.
+
+    Timers can be added from any thread, they are run by the thread calling
+    pop_due().
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def add(self, delay, callback, args=(), interval=None):
+        """Add a new timer.
+
+        :param delay: seconds until the first call
+        :type delay: float
+
+        :param interval: seconds between calls of a repeated timer, None for one call
+        :type interval: float
+
+        :return: the new timer and whether it is the next timer to run
+        :rtype: (TimerHandle, bool)
+
+        :raises ValueError: when the interval is not positive
+        """
+        if interval is not None and interval <= 0:
+            raise ValueError("Interval of the timer has to be positive.")
+        handle = TimerHandle(time.monotonic() + delay, interval, callback, args)
+        with self._lock:
+            self._push(handle)
+            return handle, self._heap[0][2] is handle
+
+    def _push(self, handle):
+        heapq.heappush(self._heap, (handle.when, next(self._order), handle))
+
+    def timeout(self):
+        """Return seconds until the next timer or None if there is no timer."""
+        with self._lock:
+            while self._heap and self._heap[0][2].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - time.monotonic())
+
+    def pop_due(self):
+        """Remove the timers which should run now and return them in order.
+
+        Repeated timers are scheduled again. Calls missed because the UI
+        thread was busy are skipped, not run in a burst.
+        """
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                handle = heapq.heappop(self._heap)[2]
+                if handle.cancelled:
+                    continue
+                due.append(handle)
+                if handle.interval is not None:
+                    handle.when += handle.interval
+                    if handle.when <= now:
+                        handle.when = now + handle.interval
+                    self._push(handle)
+        return due
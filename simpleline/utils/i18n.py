@@ -17,13 +17,41 @@
 # Red Hat, Inc.
 #
 
-__all__ = ["_", "N_", "P_", "C_", "CN_", "CP_"]
+__all__ = ["_", "N_", "P_", "C_", "CN_", "CP_", "reload_translation"]
 
+import functools
 import gettext
 
+# Translation catalog is looked up only once, call reload_translation()
+# when the locale is switched.
+_translation = None
+
+# Number of translations with context kept by C_ and CP_ each
+CONTEXT_CACHE_SIZE = 1024
+
+
+def _get_translation():
+    global _translation
+    if _translation is None:
+        _translation = gettext.translation("python-simpleline", fallback=True)
+    return _translation
+
+
+def reload_translation():
+    """Drop the cached translation catalog and translations with context.
+
+    The catalog is loaded again on the next translation request. This has to
+    be called after the locale is changed.
+    """
+    global _translation
+    _translation = None
+    C_.cache_clear()
+    CP_.cache_clear()
+
+
 N_ = lambda x: x
-_ = lambda x: gettext.translation("python-simpleline", fallback=True).gettext(x) if x != "" else ""
-P_ = lambda x, y, z: gettext.translation("python-simpleline", fallback=True).ngettext(x, y, z)
+_ = lambda x: _get_translation().gettext(x) if x != "" else ""
+P_ = lambda x, y, z: _get_translation().ngettext(x, y, z)
 
 # This is equivalent to "pgettext" in GNU gettext. The pgettext functions
 # are not exported by Python, but all they really do is a stick a EOT
@@ -31,6 +59,7 @@ P_ = lambda x, y, z: gettext.translation("python-simpleline", fallback=True).nge
 # of the return value.
 
 
+@functools.lru_cache(maxsize=CONTEXT_CACHE_SIZE)
 def C_(msgctxt, msgid):
     ctxid = "%s\x04%s" % (msgctxt, msgid)
     translation = _(ctxid)
@@ -47,6 +76,7 @@ CN_ = lambda c, x: x
 # npgettext; i.e., gettext with plural form and context
 
 
+@functools.lru_cache(maxsize=CONTEXT_CACHE_SIZE)
 def CP_(msgctxt, msgid, msgid_plural, n):
     ctxid = "%s\x04%s" % (msgctxt, msgid)
     translation = P_(ctxid, msgid_plural, n)
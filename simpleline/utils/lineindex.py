@@ -0,0 +1,98 @@
+# Search index of widget lines.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["LineIndex"]
+
+from array import array
+from bisect import bisect_right
+
+
+class LineIndex(object):
+    """Index of lines for case insensitive substring search.
+
+    The lowercased lines are joined to one text once and the offsets of
+    the line starts are kept in an array. A query is one str.find() or
+    str.rfind() from the current line, the line of the found offset is
+    found by a binary search of the line starts. Text split to two lines
+    by wrapping is not found.
+    """
+
+    def __init__(self, lines):
+        """
+        :param lines: lines to index
+        :type lines: iterable of str
+        """
+        lowered = [line.lower() for line in lines]
+        self._starts = array("q")
+        offset = 0
+        for line in lowered:
+            self._starts.append(offset)
+            offset += len(line) + 1
+        self._text = u"\n".join(lowered)
+
+    def __len__(self):
+        return len(self._starts)
+
+    def _line_of(self, offset):
+        return bisect_right(self._starts, offset) - 1
+
+    def matches(self, text):
+        """Return numbers of lines containing the text.
+
+        :param text: text to find, case is ignored
+        :type text: str
+
+        :rtype: list(int)
+        """
+        numbers = []
+        line = self.find_next(text, -1)
+        while line is not None:
+            numbers.append(line)
+            line = self.find_next(text, line)
+        return numbers
+
+    def find_next(self, text, line):
+        """Return number of the first line after the line containing the text or None.
+
+        :param text: text to find, case is ignored
+        :type text: str
+
+        :param line: number of the line to search after, -1 to search from the start
+        :type line: int
+        """
+        if u"\n" in text or line + 1 >= len(self._starts):
+            return None
+        offset = self._text.find(text.lower(), self._starts[max(0, line + 1)])
+        return None if offset < 0 else self._line_of(offset)
+
+    def find_previous(self, text, line):
+        """Return number of the last line before the line containing the text or None.
+
+        :param text: text to find, case is ignored
+        :type text: str
+
+        :param line: number of the line to search before
+        :type line: int
+        """
+        if u"\n" in text or line <= 0 or not self._starts:
+            return None
+        # the match has to end before the newline preceding the line
+        end = self._starts[line] - 1 if line < len(self._starts) else len(self._text)
+        offset = self._text.rfind(text.lower(), 0, end)
+        return None if offset < 0 else self._line_of(offset)
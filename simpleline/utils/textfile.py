@@ -0,0 +1,139 @@
+# Cached loading of text files.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["TextFileCache", "text_file_cache"]
+
+import os
+import mmap
+import locale
+import threading
+from collections import OrderedDict
+
+
+class TextFileCache(object):
+    """Bounded LRU cache of text files.
+
+    A file is read again only when its modification time or size changes,
+    so screens showing the same file (help, licenses) on every refresh get
+    the same string without reading the file. Large files are decoded
+    directly from a memory mapping of the file.
+    """
+
+    DEFAULT_MAXSIZE = 16
+
+    # files with at least this number of bytes are read through mmap
+    MMAP_THRESHOLD = 64 * 1024
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """
+        :param maxsize: maximum number of files kept, 0 disables the cache
+        :type maxsize: int
+        """
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """Maximum number of files kept in the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            self._trim()
+
+    @property
+    def hits(self):
+        """Number of files found in the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of files which had to be read."""
+        return self._misses
+
+    def __len__(self):
+        return len(self._cache)
+
+    def read(self, path, encoding=None):
+        """Return content of the text file, use the cached value if the file did not change.
+
+        Newlines are translated to "\\n" as by open() in text mode.
+
+        :param path: path to the file
+        :type path: str
+
+        :param encoding: encoding of the file (preferred locale encoding if None)
+        :type encoding: str
+
+        :raises OSError: when the file can't be read
+        """
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (path, encoding)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == version:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached[1]
+            self._misses += 1
+
+        text = self._load(path, encoding, stat.st_size)
+
+        with self._lock:
+            if self._maxsize > 0:
+                self._cache[key] = (version, text)
+                self._cache.move_to_end(key)
+                self._trim()
+        return text
+
+    def _load(self, path, encoding, size):
+        if size < self.MMAP_THRESHOLD or not size:
+            # empty files can't be mapped
+            with open(path, "r", encoding=encoding) as f:
+                return f.read()
+
+        if encoding is None:
+            encoding = locale.getpreferredencoding(False)
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                text = str(mapping, encoding)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def clear(self):
+        """Remove all files from the cache and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def _trim(self):
+        while len(self._cache) > max(self._maxsize, 0):
+            self._cache.popitem(last=False)
+
+
+# Process-wide cache used by screens
+text_file_cache = TextFileCache()
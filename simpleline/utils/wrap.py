@@ -0,0 +1,177 @@
+# Word wrapping of the widget text.
+#
+# Copyright (C) 2016  Red Hat, Inc.
+#
+# This copyrighted material is made available to anyone wishing to use,
+# modify, copy, or redistribute it subject to the terms and conditions of
+# the GNU General Public License v.2, or (at your option) any later version.
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY expressed or implied, including the implied warranties of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General
+# Public License for more details.  You should have received a copy of the
+# GNU General Public License along with this program; if not, write to the
+# Free Software Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA
+# 02110-1301, USA.  Any Red Hat trademarks that are incorporated in the
+# source code or documentation are not subject to the GNU General Public
+# License and may only be used or replicated with the express permission of
+# Red Hat, Inc.
+#
+
+__all__ = ["WrapCache", "wrap_cache", "wordwrap_text"]
+
+import threading
+from collections import OrderedDict
+from textwrap import wrap
+
+
+def wordwrap_text(text, width):
+    """Wrap text by words so it can be written to a widget width columns wide.
+
+    Lines shorter than width are ended by a newline, lines with exactly width
+    characters are left to the width based wrapping of Widget.write().
+
+    :param text: text to wrap
+    :type text: str
+
+    :param width: number of columns available for the text
+    :type width: int
+
+    :return: text with newlines inserted
+    :rtype: str
+    """
+    lines = []
+    # Wrap each line separately
+    for line in text.split('\n'):
+        sublines = []
+        for subline in wrap(line, width):
+            sublines.append(subline)
+            if len(subline) < width:
+                # line shorter than width will be wrapped by '\n' we add
+                sublines.append('\n')
+            # line with length == width will be wrapped by the width based
+            # wrapping logic
+        # end of line will be wrapped by '\n' following the line in
+        # original text
+        if sublines and sublines[-1] == '\n':
+            sublines.pop()
+        lines.append("".join(sublines))
+    return '\n'.join(lines)
+
+
+class WrapCache(object):
+    """Bounded LRU cache of word wrapped texts.
+
+    Screens are redrawn often with the same texts, the cache saves wrapping
+    of the same text at the same width again and again.
+
+    The cache is bounded by the number of texts and by the total number of
+    characters of the texts and their wrapped copies. Texts taking more
+    than a quarter of the characters limit are not cached at all, so one
+    large or growing text (logs) can't push out all the others.
+    """
+
+    DEFAULT_MAXSIZE = 512
+    DEFAULT_MAXCHARS = 1024 * 1024
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, maxchars=DEFAULT_MAXCHARS):
+        """
+        :param maxsize: maximum number of wrapped texts kept, 0 disables the cache
+        :type maxsize: int
+
+        :param maxchars: maximum number of characters of the texts and
+                         their wrapped copies kept
+        :type maxchars: int
+        """
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._maxsize = maxsize
+        self._maxchars = maxchars
+        self._chars = 0
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """Maximum number of wrapped texts kept in the cache."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            self._trim()
+
+    @property
+    def maxchars(self):
+        """Maximum number of characters kept in the cache."""
+        return self._maxchars
+
+    @maxchars.setter
+    def maxchars(self, value):
+        with self._lock:
+            self._maxchars = value
+            self._trim()
+
+    @property
+    def chars(self):
+        """Number of characters of the texts and their wrapped copies in the cache."""
+        return self._chars
+
+    @property
+    def hits(self):
+        """Number of texts found in the cache."""
+        return self._hits
+
+    @property
+    def misses(self):
+        """Number of texts which had to be wrapped."""
+        return self._misses
+
+    def __len__(self):
+        return len(self._cache)
+
+    def wrap(self, text, width):
+        """Return text wrapped by wordwrap_text(), use the cached value if possible.
+
+        :param text: text to wrap
+        :type text: str
+
+        :param width: number of columns available for the text
+        :type width: int
+        """
+        key = (text, width)
+        with self._lock:
+            wrapped = self._cache.get(key)
+            if wrapped is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return wrapped
+            self._misses += 1
+
+        wrapped = wordwrap_text(text, width)
+
+        size = len(text) + len(wrapped)
+        with self._lock:
+            if self._maxsize > 0 and size <= self._maxchars // 4 and key not in self._cache:
+                self._cache[key] = wrapped
+                self._chars += size
+                self._trim()
+        return wrapped
+
+    def clear(self):
+        """Remove all texts from the cache and reset the counters."""
+        with self._lock:
+            self._cache.clear()
+            self._chars = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _trim(self):
+        while self._cache and (len(self._cache) > max(self._maxsize, 0)
+                               or self._chars > self._maxchars):
+            (text, _width), wrapped = self._cache.popitem(last=False)
+            self._chars -= len(text) + len(wrapped)
+
+
+# Process-wide cache used by widgets
+wrap_cache = WrapCache()
@@ -20,17 +20,89 @@
 #
 
 __all__ = ["Widget", "TextWidget", "ColumnWidget","CheckboxWidget",
-           "CenterWidget"]
+           "CenterWidget", "ListWidget", "StreamWidget", "LogWidget"]
 
 
-import functools
+import weakref
+import threading
 from textwrap import wrap
-from simpleline.utils.i18n import _
+from collections import deque
+from simpleline.buffers import CharListBuffer
+from simpleline.utils.i18n import _, N_
 from simpleline.utils import ensure_str
+from simpleline.utils.wrap import wrap_cache
+from simpleline.utils.lineindex import LineIndex
+
+
+class RenderStats(object):
+    """Counters of widget renders performed and skipped by Widget.update().
+
+    Counters of the current frame are available in the performed and skipped
+    attributes, finished frames are stored in the history as
+    (performed, skipped) tuples.
+
+    When a frame is started with a tracer, every widget render performed
+    by Widget.update() in the frame is measured as a "render" span of the
+    screen, including widgets rendered by other widgets.
+    """
+
+    HISTORY_SIZE = 100
+
+    def __init__(self):
+        self.history = deque(maxlen=self.HISTORY_SIZE)
+        self.performed = 0
+        self.skipped = 0
+        self.total_performed = 0
+        self.total_skipped = 0
+        self.tracer = None
+        self.screen = None
+
+    def begin_frame(self, tracer=None, screen=None):
+        """Start counting renders of a new frame.
+
+        :param tracer: tracer measuring the renders
+        :type tracer: simpleline.profiling.Tracer instance or None
+
+        :param screen: screen rendered in the frame
+        :type screen: UIScreen instance
+        """
+        self.performed = 0
+        self.skipped = 0
+        self.tracer = tracer
+        self.screen = screen
+
+    def end_frame(self):
+        """Store counters of the current frame to history."""
+        self.history.append((self.performed, self.skipped))
+        self.tracer = None
+        self.screen = None
+
+    def add_performed(self):
+        self.performed += 1
+        self.total_performed += 1
+
+    def add_skipped(self):
+        self.skipped += 1
+        self.total_skipped += 1
+
+
+# Render counters of all widgets
+render_stats = RenderStats()
 
 
 class Widget(object):
 
+    # Class used for storing content of the widget. It can be changed to
+    # simpleline.buffers.RowStringBuffer to save memory and rendering time on
+    # large screens, the content property then returns rows as strings.
+    buffer_class = CharListBuffer
+
+    # Skip rendering in update() when the widget did not change since it was
+    # rendered last time with the same width. Only widgets which are fully
+    # described by their attributes (and mark themselves dirty when they
+    # change) can use the cache.
+    render_cache = False
+
     def __init__(self, max_width=None, default=None):
         """Initializes base Widgets buffer.
 
@@ -40,31 +112,41 @@ class Widget(object):
         :param default: string containing the default content to fill the buffer with
         :type default: string
         """
-        self._buffer = []
-        if default:
-            self._buffer = [[c for c in l] for l in default.split("\n")]
+        self._buffer = self.buffer_class(default)
         self._max_width = max_width
         self._cursor = (0, 0)  # row, col
 
+        # render cache state, see update()
+        self._dirty = True
+        self._rendered_width = None
+        self._parents = weakref.WeakSet()
+
+        # search index of the lines, built on request
+        self._line_index = None
+
     @property
     def height(self):
         """The current height of the internal buffer."""
-        return len(self._buffer)
+        return self._buffer.height
 
     @property
     def width(self):
         """The current width of the internal buffer (id of the first empty column)."""
-        return functools.reduce(lambda acc, l: max(acc, len(l)), self._buffer, 0)
+        return self._buffer.width
 
     def clear(self):
         """Clears this widgets buffer and resets cursor."""
-        self._buffer = list()
+        self._buffer.clear()
         self._cursor = (0, 0)
+        self._line_index = None
 
     @property
     def content(self):
-        """Return a list (rows) of lists (columns) with one character elements."""
-        return self._buffer
+        """Return a list (rows) of sequences (columns) with one character elements.
+
+        Rows are lists of one character strings or strings depending on the buffer_class.
+        """
+        return self._buffer.rows
 
     def render(self, width):
         """Redraw the widget's self._buffer.
@@ -77,13 +159,102 @@ class Widget(object):
         """
         self.clear()
 
+    def update(self, width):
+        """Render the widget unless the previous render can be reused.
+
+        The render is skipped when render_cache is enabled, the widget is
+        not dirty and it was rendered with the same width last time.
+
+        :param width: the width of buffer requested by the caller
+        :type width: int
+
+        :return: True if the widget was rendered
+        :rtype: bool
+        """
+        if self.render_cache and not self._dirty and self._rendered_width == width:
+            render_stats.add_skipped()
+            return False
+
+        # changes made while rendering (from other threads) mark the widget
+        # dirty again
+        self._dirty = False
+        if render_stats.tracer is None:
+            self.render(width)
+        else:
+            with render_stats.tracer.span("render", render_stats.screen, self):
+                self.render(width)
+        self._rendered_width = width
+        render_stats.add_performed()
+        return True
+
+    @property
+    def dirty(self):
+        """The widget has to be rendered again."""
+        return self._dirty
+
+    def mark_dirty(self):
+        """Request render of this widget and all widgets containing it."""
+        self._dirty = True
+        for parent in list(self._parents):
+            parent.mark_dirty()
+
+    def add_children(self, *widgets):
+        """Register widgets drawn by this widget.
+
+        Children marked dirty will mark this widget dirty too.
+
+        :param widgets: child widgets
+        :type widgets: Widget instances
+        """
+        for w in widgets:
+            w._parents.add(self)  # pylint: disable=protected-access
+
     def get_lines(self):
         """Return lines to write out in order to show this widget.
 
         :return: lines representing this widget
         :rtype: list(str)
         """
-        return [str(u"".join(line)) for line in self._buffer]
+        return self._buffer.get_lines()
+
+    # Whether get_line_range() can return lines before the last requested
+    # range. Widgets streaming their lines from a source which can't be read
+    # again are paged only forward.
+    seekable = True
+
+    def get_line_range(self, start, stop):
+        """Return lines from start to stop without building all the lines.
+
+        The result is shorter than requested at the end of the widget. Long
+        widgets are paged by this method, so only lines shown on the screen
+        are created.
+
+        :param start: index of the first line
+        :type start: int
+
+        :param stop: index after the last line
+        :type stop: int
+
+        :return: lines representing the part of this widget
+        :rtype: list(str)
+        """
+        return self._buffer.get_lines(start, stop)
+
+    def iter_lines(self):
+        """Return iterator over the lines of this widget."""
+        return iter(self.get_lines())
+
+    def line_index(self):
+        """Return search index of the lines of this widget.
+
+        The index is built on the first request after the widget was
+        rendered and used until the content changes.
+
+        :rtype: simpleline.utils.lineindex.LineIndex
+        """
+        if self._line_index is None:
+            self._line_index = LineIndex(self.iter_lines())
+        return self._line_index
 
     def setxy(self, row, col):
         """Set cursor position.
@@ -127,18 +298,11 @@ class Widget(object):
         if col is None:
             col = self._cursor[1]
 
-        # fill up rows to accommodate for w.height
-        if self.height < row + w.height:
-            for _i in range(row + w.height - self.height):
-                self._buffer.append(list())
+        self._line_index = None
 
-        # append columns to accommodate for w.width
-        for l in range(row, row + w.height):
-            l_len = len(self._buffer[l])
-            w_len = len(w.content[l - row])
-            if l_len < col + w_len:
-                self._buffer[l] += ((col + w_len - l_len) * list(u" "))
-            self._buffer[l][col:col + w_len] = w.content[l - row][:]
+        # copy rows of w, missing rows and columns are created by the buffer
+        for l, w_line in enumerate(w.content, row):
+            self._buffer.put(l, col, w_line)
 
         # move the cursor to new spot
         if block:
@@ -171,6 +335,7 @@ class Widget(object):
             return
 
         text = ensure_str(text)
+        self._line_index = None
         if row is None:
             row = self._cursor[0]
 
@@ -184,55 +349,41 @@ class Widget(object):
         y = col
 
         if wordwrap:
-            lines = []
-            # Wrap each line separately
-            for line in text.split('\n'):
-                sublines = []
-                for subline in wrap(line, width):
-                    sublines.append(subline)
-                    if len(subline) < width:
-                        # line shorter than width will be wrapped by '\n' we add
-                        sublines.append('\n')
-                    # line with length == width will be wrapped by the width based
-                    # wrapping logic
-                # end of line will be wrapped by '\n' following the line in
-                # original text
-                if sublines and sublines[-1] == '\n':
-                    sublines.pop()
-                lines.append("".join(sublines))
-            text = '\n'.join(lines)
-
-        # emulate typing machine
-        for character in text:
+            text = wrap_cache.wrap(text, width)
+
+        # emulate typing machine, the text is split to runs of characters
+        # which end at a newline or at the wrapping column and every run is
+        # copied to the buffer at once
+        for line_no, line in enumerate(text.split("\n")):
             # process newline
-            if character == "\n":
+            if line_no:
                 x += 1
                 if block:
                     y = col
                 else:
                     y = 0
-                continue
-
-            # if the line is not in buffer, create it
-            if x >= len(self._buffer):
-                for _i in range(x - len(self._buffer) + 1):
-                    self._buffer.append(list())
 
-            # if the line's length is not enough, fill it with spaces
-            if y >= len(self._buffer[x]):
-                self._buffer[x] += ((y - len(self._buffer[x]) + 1) * list(u" "))
-
-            # "type" character
-            self._buffer[x][y] = character
-
-            # shift to the next char
-            y += 1
-            if not width is None and y >= col + width:
-                x += 1
-                if block:
-                    y = col
+            pos = 0
+            line_len = len(line)
+            while pos < line_len:
+                if width is None:
+                    end = line_len
                 else:
-                    y = 0
+                    # at least one character is typed before wrapping
+                    end = pos + max(1, col + width - y)
+
+                run = line[pos:end]
+                self._buffer.put(x, y, run)
+                pos += len(run)
+
+                # shift to the next char
+                y += len(run)
+                if not width is None and y >= col + width:
+                    x += 1
+                    if block:
+                        y = col
+                    else:
+                        y = 0
 
         self._cursor = (x, y)
 
@@ -248,6 +399,16 @@ class TextWidget(Widget):
         super().__init__()
         self._text = text
 
+    @property
+    def text(self):
+        """Text of the widget."""
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.mark_dirty()
+
     def render(self, width):
         """Renders the text widget limited to width number of columns (wraps to the next line when the text is longer).
 
@@ -270,6 +431,7 @@ class CenterWidget(Widget):
         """
         super().__init__()
         self._w = w
+        self.add_children(w)
 
     def render(self, width):
         """Render the centered widget to internal buffer.
@@ -278,7 +440,7 @@ class CenterWidget(Widget):
         :type width: int
         """
         super().render(width)
-        self._w.render(width)
+        self._w.update(width)
         # make sure col is an integer
         self.draw(self._w, col=(width - self._w.width) // 2)
 
@@ -297,6 +459,8 @@ class ColumnWidget(Widget):
         super().__init__()
         self._spacing = spacing
         self._columns = columns
+        for _width, col in columns:
+            self.add_children(*col)
 
     def render(self, width):
         """Render the widget to it's internal buffer
@@ -328,7 +492,7 @@ class ColumnWidget(Widget):
 
             # render and draw contents of column
             for item in col:
-                item.render(col_max_width)
+                item.update(col_max_width)
                 self.draw(item, block=True)
 
             # recompute the leftmost empty column
@@ -396,12 +560,430 @@ class CheckboxWidget(Widget):
         """Returns the first line (main title) of the checkbox."""
         return self._title
 
+    @title.setter
+    def title(self, value):
+        self._title = value
+        self.mark_dirty()
+
     @property
     def completed(self):
         """Returns the state of the checkbox, checked is True."""
         return self._completed
 
+    @completed.setter
+    def completed(self, value):
+        self._completed = value
+        self.mark_dirty()
+
     @property
     def text(self):
         """Contains the description text from the second line."""
         return self._text
+
+    @text.setter
+    def text(self, value):
+        self._text = value
+        self.mark_dirty()
+
+
+class ListWidget(Widget):
+    """Widget showing one page of a possibly huge list of items.
+
+    Only items of the visible page are taken from the source and rendered,
+    so the time and memory needed do not depend on the number of items.
+    The source is a sequence (only __len__ and __getitem__ with integers
+    are used) or a function returning items of a range for lazy sources.
+    """
+
+    STATUS = N_(u"Items %(first)d-%(last)d of %(total)d")
+
+    def __init__(self, items, page_size=20, formatter=None, length=None, numbered=True,
+                 show_status=True):
+        """
+        :param items: items to show
+        :type items: sequence or func(start, stop) returning items from start to stop
+
+        :param page_size: number of items on one page
+        :type page_size: int
+
+        :param formatter: function returning text or widget for the item, items
+                          are converted by str() and numbered by default
+        :type formatter: func(index, item)
+
+        :param length: number of items, required when items is a function
+        :type length: int
+
+        :param numbered: prefix items by their number (ignored with formatter)
+        :type numbered: bool
+
+        :param show_status: show position in the list below the items
+        :type show_status: bool
+        """
+        super().__init__()
+        if page_size < 1:
+            raise ValueError("Page size has to be positive.")
+
+        if callable(items) and not hasattr(items, "__getitem__"):
+            if length is None:
+                raise ValueError("Length is required for the item function.")
+            self._fetch = items
+        else:
+            self._fetch = lambda start, stop: [items[i] for i in range(start, stop)]
+            length = len(items) if length is None else length
+
+        self._length = length
+        self._page_size = page_size
+        self._formatter = formatter
+        self._numbered = numbered
+        self._show_status = show_status
+        self._position = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def length(self):
+        """Number of items in the list."""
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
+        self._position = min(self._position, self._last_position())
+        self.mark_dirty()
+
+    @property
+    def page_size(self):
+        """Number of items on one page."""
+        return self._page_size
+
+    @property
+    def page(self):
+        """Index of the visible page, starts with 0."""
+        return self._position // self._page_size
+
+    @property
+    def page_count(self):
+        """Number of pages, an empty list has one empty page."""
+        return max(1, (self._length + self._page_size - 1) // self._page_size)
+
+    @property
+    def visible_range(self):
+        """Range of indexes of the visible items."""
+        return range(self._position, min(self._position + self._page_size, self._length))
+
+    def _last_position(self):
+        return (self.page_count - 1) * self._page_size
+
+    def show_page(self, page):
+        """Show the page, the value is limited to the existing pages.
+
+        :param page: index of the page, starts with 0
+        :type page: int
+        """
+        position = max(0, min(page * self._page_size, self._last_position()))
+        if position != self._position:
+            self._position = position
+            self.mark_dirty()
+
+    def next_page(self):
+        """Show the next page.
+
+        :return: False if the last page is already shown
+        :rtype: bool
+        """
+        page = self.page
+        self.show_page(page + 1)
+        return self.page != page
+
+    def previous_page(self):
+        """Show the previous page.
+
+        :return: False if the first page is already shown
+        :rtype: bool
+        """
+        page = self.page
+        self.show_page(page - 1)
+        return self.page != page
+
+    def jump_to(self, index):
+        """Show the page with the item.
+
+        :param index: index of the item, starts with 0
+        :type index: int
+        """
+        self.show_page(index // self._page_size)
+
+    def get_item(self, index):
+        """Return the item from the source.
+
+        :param index: index of the item, starts with 0
+        :type index: int
+        """
+        if not 0 <= index < self._length:
+            raise IndexError("List item index out of range.")
+        return self._fetch(index, index + 1)[0]
+
+    def format_item(self, index, item):
+        """Return text or widget representing the item."""
+        if self._formatter:
+            return self._formatter(index, item)
+        elif self._numbered:
+            return u"%d) %s" % (index + 1, item)
+        else:
+            return str(item)
+
+    def render(self, width):
+        """Render the visible page of items.
+
+        :param width: maximum width of the widget
+        :type width: int
+        """
+        super().render(width)
+        visible = self.visible_range
+        items = self._fetch(visible.start, visible.stop) if visible else []
+
+        row = 0
+        for index, item in zip(visible, items):
+            value = self.format_item(index, item)
+            if isinstance(value, Widget):
+                value.update(width)
+                self.draw(value, row=row, col=0)
+                row += max(1, value.height)
+            else:
+                self.setxy(row, 0)
+                self.write(value, width=width, wordwrap=True)
+                row = max(row + 1, self.height)
+
+        if self._show_status and self._length > self._page_size:
+            self.setxy(row, 0)
+            self.write(_(self.STATUS) % {"first": visible.start + 1, "last": visible.stop,
+                                         "total": self._length},
+                       width=width, wordwrap=True)
+
+
+class StreamWidget(Widget):
+    """Widget producing lines of a long text lazily.
+
+    The text is read from the source line by line and wrapped only when
+    the lines are requested, so long outputs (logs, files, command output)
+    are paged without keeping all of them in memory. Lines are not stored
+    in the buffer of the widget. Drawing it to other widgets (the content,
+    height and width properties) builds all the lines once per render and
+    keeps them until the next render.
+    """
+
+    def __init__(self, source):
+        """
+        :param source: lines of the text, a function returning a new iterator
+                       makes the widget seekable
+        :type source: iterable of str or func() returning iterable of str
+        """
+        super().__init__()
+        if callable(source):
+            self._source = source
+            self._iterable = None
+        else:
+            self._source = None
+            self._iterable = source
+        self._wrap_width = None
+        self._lines = None
+        # all the lines once they were requested together
+        self._all_lines = None
+        self._next = 0
+        # the last requested lines, they can be requested again without seeking
+        self._recent = deque(maxlen=0)
+
+    @property
+    def seekable(self):
+        return self._source is not None
+
+    def render(self, width):
+        """Start producing lines wrapped to the width.
+
+        :param width: maximum width of the lines
+        :type width: int
+        """
+        super().render(width)
+        if self.seekable or width != self._wrap_width:
+            # the source which can't be read again keeps the built lines
+            self._all_lines = None
+        self._wrap_width = width
+        self._lines = None
+
+    def _wrap(self, iterable):
+        for text in iterable:
+            text = ensure_str(text).rstrip(u"\n")
+            if self._wrap_width is None or len(text) <= self._wrap_width:
+                yield text
+            else:
+                line = TextWidget(text)
+                line.render(self._wrap_width)
+                yield from line.get_lines()
+
+    def _restart(self):
+        if self._source is not None:
+            iterable = self._source()
+        elif self._iterable is not None:
+            iterable = self._iterable
+            self._iterable = None
+        else:
+            raise ValueError("The source of the widget can't be read again.")
+        self._lines = self._wrap(iterable)
+        self._next = 0
+        self._recent.clear()
+
+    def get_line_range(self, start, stop):
+        if self._all_lines is not None:
+            return self._all_lines[start:stop]
+
+        first_recent = self._next - len(self._recent)
+        if self._lines is None or start < first_recent:
+            self._restart()
+            first_recent = 0
+
+        result = list(self._recent)[max(0, start - first_recent):max(0, stop - first_recent)]
+        if self._recent.maxlen < stop - start:
+            self._recent = deque(self._recent, maxlen=stop - start)
+
+        while self._next < stop:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            self._recent.append(line)
+            self._next += 1
+            if self._next > start:
+                result.append(line)
+        return result
+
+    def iter_lines(self):
+        if self._all_lines is not None:
+            return iter(self._all_lines)
+        return self._iter_source()
+
+    def _iter_source(self):
+        self._restart()
+        for line in self._lines:
+            self._next += 1
+            yield line
+        self._lines = None
+
+    def get_lines(self):
+        if self._all_lines is None:
+            self._all_lines = list(self._iter_source())
+        return self._all_lines
+
+    @property
+    def content(self):
+        return self.get_lines()
+
+    @property
+    def height(self):
+        return len(self.content)
+
+    @property
+    def width(self):
+        return max((len(line) for line in self.content), default=0)
+
+
+class LogWidget(Widget):
+    """Widget following the end of a growing log.
+
+    Lines are kept in a ring buffer, the oldest lines are dropped when it is
+    full. Only the last lines fitting to the visible height are rendered.
+    Every line keeps its wrapped rows for the last width, so a render after
+    an append wraps only the new lines.
+
+    Lines can be appended from any thread, for example from a handler of
+    the hub queue messages:
+
+        log_widget = LogWidget(visible_lines=15)
+        app.register_event_handler(hubQ.HUB_CODE_MESSAGE,
+                                   lambda event, data: log_widget.append(event[1][1]))
+    """
+
+    render_cache = True
+
+    def __init__(self, capacity=1000, visible_lines=20):
+        """
+        :param capacity: maximum number of log lines kept
+        :type capacity: int
+
+        :param visible_lines: number of rows shown, long lines take more rows
+        :type visible_lines: int
+        """
+        super().__init__()
+        if capacity < 1 or visible_lines < 1:
+            raise ValueError("Capacity and visible lines have to be positive.")
+        self._lock = threading.Lock()
+        # [text, width of the wrapped rows, wrapped rows]
+        self._lines = deque(maxlen=capacity)
+        self._visible_lines = visible_lines
+
+    def __len__(self):
+        return len(self._lines)
+
+    @property
+    def capacity(self):
+        """Maximum number of log lines kept."""
+        return self._lines.maxlen
+
+    @property
+    def visible_lines(self):
+        """Number of rows shown."""
+        return self._visible_lines
+
+    @visible_lines.setter
+    def visible_lines(self, value):
+        self._visible_lines = value
+        self.mark_dirty()
+
+    @property
+    def lines(self):
+        """Log lines in the buffer, the oldest first."""
+        with self._lock:
+            return [entry[0] for entry in self._lines]
+
+    def append(self, text):
+        """Add text to the end of the log.
+
+        :param text: one or more lines of the log
+        :type text: str
+        """
+        lines = ensure_str(text).rstrip(u"\n").split(u"\n")
+        with self._lock:
+            self._lines.extend([line, None, None] for line in lines)
+        self.mark_dirty()
+
+    def clear_log(self):
+        """Remove all lines of the log."""
+        with self._lock:
+            self._lines.clear()
+        self.mark_dirty()
+
+    @staticmethod
+    def _wrap_line(text, width):
+        return wrap(text, width) or [u""]
+
+    def render(self, width):
+        """Render the last rows of the log.
+
+        :param width: maximum width of the widget
+        :type width: int
+        """
+        super().render(width)
+        wrapped = []
+        rows = 0
+        with self._lock:
+            for entry in reversed(self._lines):
+                if entry[1] != width:
+                    entry[1] = width
+                    entry[2] = self._wrap_line(entry[0], width)
+                wrapped.append(entry[2])
+                rows += len(entry[2])
+                if rows >= self._visible_lines:
+                    break
+
+        shown = [row for line_rows in reversed(wrapped) for row in line_rows]
+        for row, text in enumerate(shown[-self._visible_lines:]):
+            self._buffer.put(row, 0, text)
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import asyncio
+import unittest
+from unittest import mock
+from simpleline.async_app import AsyncApp
+from simpleline.base import UIScreen
+from simpleline.communication.communication import hubQ, HUB_PRIORITIES
+from simpleline.output import BufferedOutput
+from simpleline.profiling import Tracer
+from simpleline.prompt import Prompt
+
+
+class InputScreen(UIScreen):
+    def __init__(self, app):
+        super().__init__(app)
+        self.keys = []
+
+    def input(self, args, key):
+        self.keys.append(key)
+        return key
+
+
+class AsyncApp_TestCase(unittest.TestCase):
+    def setUp(self):
+        read_fd, self._write_fd = os.pipe()
+        self._stdin = os.fdopen(read_fd, "r")
+        self._patch = mock.patch("sys.stdin", self._stdin)
+        self._patch.start()
+        self.output = io.StringIO()
+        self.app = AsyncApp("Test", output=BufferedOutput(self.output))
+
+    def tearDown(self):
+        self._patch.stop()
+        self._stdin.close()
+        os.close(self._write_fd)
+
+    def _type(self, text):
+        os.write(self._write_fd, text.encode("utf-8"))
+
+    async def _wait_for_prompt(self, count):
+        while self.output.getvalue().count(Prompt.DEFAULT_MESSAGE) < count:
+            await asyncio.sleep(0.001)
+
+    def _run(self, coroutine):
+        return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+    def test_run(self):
+        screen = InputScreen(self.app)
+        self.app.schedule_screen(screen)
+        self._type(u"kůň\n" + Prompt.CONTINUE + "\n")
+
+        self.assertTrue(self._run(self.app.run_async()))
+        self.assertEqual(screen.keys, [u"kůň", Prompt.CONTINUE])
+
+    def test_app_arguments(self):
+        tracer = Tracer()
+        app = AsyncApp("Test", output=BufferedOutput(self.output), tracer=tracer, queue_size=5,
+                       event_priorities=HUB_PRIORITIES)
+        self.assertIs(app.tracer, tracer)
+        self.assertEqual(app.metrics_snapshot()["queue_size"], 5)
+
+        screen = InputScreen(app)
+        app.schedule_screen(screen)
+        self._type(Prompt.CONTINUE + "\n")
+        self.assertTrue(self._run(app.run_async()))
+        self.assertIn("input_wait", {record.phase for record in tracer.records})
+
+    def test_call_in_full_queue(self):
+        app = AsyncApp("Test", output=BufferedOutput(self.output), queue_size=1)
+        app.queue_instance.put(("other", []))
+
+        async def call():
+            task = asyncio.ensure_future(app.call_in_ui(lambda: 42))
+            await asyncio.sleep(0.01)
+            # the event loop did not wait for the full queue
+            self.assertEqual(app.queue_instance.qsize(), 2)
+            await asyncio.get_running_loop().run_in_executor(None, app.process_events)
+            return await task
+
+        self.assertEqual(self._run(call()), 42)
+
+    def test_coroutine_handler(self):
+        events = []
+
+        async def handler(event, data):
+            await asyncio.sleep(0)
+            events.append((event[1][0], data, asyncio.get_running_loop()))
+
+        async def main():
+            self.app.register_event_handler(hubQ.HUB_CODE_MESSAGE, handler, "data")
+            app_task = asyncio.ensure_future(self.app.run_async())
+
+            # processed by the UI thread while it waits for the input
+            self.app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message"]))
+            await self.app.call_in_ui(lambda: None)
+            self.assertEqual(events, [("spoke", "data", asyncio.get_running_loop())])
+
+            self._type(Prompt.QUIT + "\n")
+            return await app_task
+
+        self.app.schedule_screen(InputScreen(self.app))
+        self.assertFalse(self._run(main()))
+
+    def test_handler_reentry(self):
+        errors = []
+        tasks = []
+
+        async def handler(event, data):
+            for call in (self.app.call_in_ui(lambda: None),
+                         self.app.switch_screen_modal_async(InputScreen(self.app))):
+                try:
+                    await call
+                except RuntimeError as e:
+                    errors.append(e)
+            # tasks of the handler can use the UI when the handler is finished
+            tasks.append(asyncio.ensure_future(self.app.call_in_ui(lambda: 42)))
+
+        async def main():
+            self.app.register_event_handler(hubQ.HUB_CODE_MESSAGE, handler)
+            app_task = asyncio.ensure_future(self.app.run_async())
+            self.app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message"]))
+            await self.app.call_in_ui(lambda: None)
+            self.assertEqual(len(errors), 2)
+            self.assertEqual(await tasks[0], 42)
+
+            self._type(Prompt.CONTINUE + "\n")
+            return await app_task
+
+        self.app.schedule_screen(InputScreen(self.app))
+        self.assertTrue(self._run(main()))
+
+    def test_modal_screen(self):
+        hub = InputScreen(self.app)
+        dialog = InputScreen(self.app)
+
+        async def main():
+            app_task = asyncio.ensure_future(self.app.run_async())
+            await self._wait_for_prompt(1)
+            modal = asyncio.ensure_future(self.app.switch_screen_modal_async(dialog))
+            self.assertEqual(await self.app.call_in_ui(lambda: 42), 42)
+            self.assertFalse(modal.done())
+
+            # input of the hub, then the dialog is shown and closed
+            self._type("1\n")
+            self._type("2\n" + Prompt.CONTINUE + "\n")
+            self.assertIs(await modal, dialog)
+
+            # back in the hub
+            self._type("3\n" + Prompt.CONTINUE + "\n")
+            return await app_task
+
+        self.app.schedule_screen(hub)
+        self.assertTrue(self._run(main()))
+        self.assertEqual(hub.keys, ["1", "3", Prompt.CONTINUE])
+        self.assertEqual(dialog.keys, ["2", Prompt.CONTINUE])
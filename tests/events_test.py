@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import unittest
+from simpleline.base import App
+from simpleline.communication import (QueueFactory, EventQueue, DROP_OLDEST, DROP_NEWEST,
+                                      COALESCE)
+from simpleline.communication.communication import hubQ, HUB_PRIORITIES
+from simpleline.headless import HeadlessDriver
+from simpleline.prompt import Prompt
+from tests.headless_test import Hub
+
+
+class Coalescing_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = App("Test")
+        self.handled = []
+        for code in (hubQ.HUB_CODE_MESSAGE, hubQ.HUB_CODE_READY):
+            self.app.register_event_handler(code, lambda event, data: self.handled.append(event))
+
+    def send_messages(self, count):
+        for i in range(count):
+            hubQ.send_message("spoke%d" % (i % 3), "message %d" % i)
+
+    def setup_hubq(self):
+        # use the hubQ queue as the application does in Anaconda
+        self.app.queue_instance = hubQ.q
+        self.addCleanup(self._clear_hubq)
+
+    def _clear_hubq(self):
+        while not hubQ.q.empty():
+            hubQ.q.get()
+
+    def test_latest_per_key(self):
+        self.setup_hubq()
+        self.app.coalesce_events(hubQ.HUB_CODE_MESSAGE, key=lambda event: event[1][0])
+        self.send_messages(1000)
+        hubQ.send_ready("spoke0", False)
+        self.send_messages(10)
+
+        self.app.process_events()
+        self.assertEqual(self.handled, [
+            (hubQ.HUB_CODE_READY, ("spoke0", False)),
+            (hubQ.HUB_CODE_MESSAGE, ("spoke1", "message 7")),
+            (hubQ.HUB_CODE_MESSAGE, ("spoke2", "message 8")),
+            (hubQ.HUB_CODE_MESSAGE, ("spoke0", "message 9")),
+        ])
+        self.assertEqual(self.app.metrics_snapshot()["coalesced"], 1007)
+
+    def test_without_key(self):
+        self.app.coalesce_events(hubQ.HUB_CODE_MESSAGE)
+        for i in range(10):
+            self.app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke%d" % i, "message"]))
+        self.app.process_events()
+        self.assertEqual(self.handled, [(hubQ.HUB_CODE_MESSAGE, ["spoke9", "message"])])
+
+    def test_not_coalesced(self):
+        self.setup_hubq()
+        self.send_messages(10)
+        self.app.process_events()
+        self.assertEqual(len(self.handled), 10)
+
+    def test_return_at(self):
+        self.app.coalesce_events(hubQ.HUB_CODE_MESSAGE)
+        q = self.app.queue_instance
+        q.put((hubQ.HUB_CODE_READY, ["spoke", False]))
+        q.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "first"]))
+        q.put((hubQ.HUB_CODE_INPUT, ["answer"]))
+        q.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "second"]))
+        q.put((hubQ.HUB_CODE_READY, ["spoke", True]))
+
+        # events after the returned one are kept for the next call
+        self.assertEqual(self.app.process_events(return_at=hubQ.HUB_CODE_INPUT),
+                         (hubQ.HUB_CODE_INPUT, ["answer"]))
+        self.assertEqual(self.handled, [(hubQ.HUB_CODE_READY, ["spoke", False])])
+        self.app.process_events()
+        self.assertEqual(self.handled[1:], [(hubQ.HUB_CODE_MESSAGE, ["spoke", "second"]),
+                                            (hubQ.HUB_CODE_READY, ["spoke", True])])
+
+    def test_input_not_coalesced(self):
+        with self.assertRaises(ValueError):
+            self.app.coalesce_events(hubQ.HUB_CODE_INPUT)
+
+    def test_one_redraw(self):
+        driver = HeadlessDriver(["1", "John", Prompt.CONTINUE])
+        app = driver.create_app("Test")
+        app.schedule_screen(Hub(app))
+        app.register_event_handler(hubQ.HUB_CODE_MESSAGE, lambda event, data: app.redraw())
+        for i in range(100):
+            app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", str(i)]))
+
+        driver.run()
+        # hub, spoke and hub again
+        self.assertEqual(driver.frames, 3)
+
+
+class BoundedQueue_TestCase(unittest.TestCase):
+    MESSAGE = 1
+    STATUS = 2
+
+    def fill(self, q, count, code=MESSAGE):
+        for i in range(count):
+            q.put((code, ["spoke%d" % (i % 2), str(i)]))
+
+    def drain(self, q):
+        items = []
+        while not q.empty():
+            items.append(q.get())
+        return items
+
+    def put_from_thread(self, q, item):
+        thread = threading.Thread(target=q.put, args=(item,))
+        thread.start()
+        self.addCleanup(thread.join)
+        return thread
+
+    def test_drop_newest(self):
+        q = EventQueue(3, DROP_NEWEST)
+        self.fill(q, 5)
+        self.assertEqual([i[1][1] for i in self.drain(q)], ["0", "1", "2"])
+        self.assertEqual(q.metrics()["dropped"], {self.MESSAGE: 2})
+
+    def test_drop_oldest(self):
+        q = EventQueue(3)
+        q.set_policy(self.MESSAGE, DROP_OLDEST)
+        q.put((self.STATUS, ["status"]))
+        self.fill(q, 5)
+        self.assertEqual(self.drain(q), [(self.STATUS, ["status"]),
+                                         (self.MESSAGE, ["spoke1", "3"]),
+                                         (self.MESSAGE, ["spoke0", "4"])])
+        self.assertEqual(q.metrics()["dropped"], {self.MESSAGE: 3})
+
+    def test_coalesce(self):
+        q = EventQueue(3)
+        q.set_policy(self.MESSAGE, COALESCE, key=lambda message: message[1][0])
+        q.put((self.STATUS, ["status"]))
+        self.fill(q, 6)
+        self.assertEqual(self.drain(q), [(self.STATUS, ["status"]),
+                                         (self.MESSAGE, ["spoke0", "4"]),
+                                         (self.MESSAGE, ["spoke1", "5"])])
+        self.assertEqual(q.metrics()["dropped"], {self.MESSAGE: 4})
+
+    def test_block(self):
+        q = EventQueue(2)
+        self.fill(q, 2)
+        with self.assertRaises(queue.Full):
+            q.put((self.MESSAGE, ["spoke", "2"]), block=False)
+        with self.assertRaises(queue.Full):
+            q.put((self.MESSAGE, ["spoke", "2"]), timeout=0.01)
+
+        thread = self.put_from_thread(q, (self.MESSAGE, ["spoke", "3"]))
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(q.get()[1][1], "0")
+        thread.join()
+        self.assertEqual([i[1][1] for i in self.drain(q)], ["1", "3"])
+        self.assertEqual(q.metrics()["blocked"], {self.MESSAGE: 2})
+
+    def test_no_deadlock(self):
+        q = EventQueue(2)
+        q.critical.add(self.STATUS)
+        self.fill(q, 2)
+        # critical messages go over the limit
+        q.put((self.STATUS, ["status"]))
+        self.assertEqual(q.qsize(), 3)
+
+        # the consumer does not wait for itself
+        q.get()
+        q.put((self.MESSAGE, ["spoke", "own"]))
+        self.assertEqual(q.qsize(), 3)
+        self.assertEqual(q.metrics()["blocked"], {})
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            EventQueue(1, "drop_all")
+
+    def test_queue_factory(self):
+        factory = QueueFactory("test", maxsize=2, default_policy=DROP_NEWEST)
+        factory.addMessage("progress", 1, policy=COALESCE)
+        factory.addMessage("step", 1)
+        factory.addMessage("done", 0, critical=True)
+
+        for i in range(3):
+            factory.send_step(i)
+            factory.send_progress(i)
+        factory.send_done()
+
+        self.assertEqual(self.drain(factory.q), [(factory.TEST_CODE_STEP, (0,)),
+                                                 (factory.TEST_CODE_PROGRESS, (2,)),
+                                                 (factory.TEST_CODE_DONE, ())])
+        self.assertEqual(factory.q.metrics()["dropped"], {factory.TEST_CODE_STEP: 2,
+                                                          factory.TEST_CODE_PROGRESS: 2})
+
+    def test_app_queue(self):
+        driver = HeadlessDriver(["1", "John", Prompt.CONTINUE])
+        app = driver.create_app("Test", queue_size=2)
+        app.schedule_screen(Hub(app))
+        app.queue_instance.set_policy(hubQ.HUB_CODE_MESSAGE, DROP_NEWEST)
+        self.fill(app.queue_instance, 10, hubQ.HUB_CODE_MESSAGE)
+        # the input is not dropped even when the queue is full
+        self.assertTrue(driver.run())
+
+        snapshot = app.metrics_snapshot()
+        self.assertEqual(snapshot["queue_size"], 2)
+        self.assertEqual(snapshot["dropped"], {hubQ.HUB_CODE_MESSAGE: 8})
+
+
+class Priority_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = App("Test", event_priorities=HUB_PRIORITIES)
+        self.handled = []
+        for code in (hubQ.HUB_CODE_MESSAGE, hubQ.HUB_CODE_READY, hubQ.HUB_CODE_SHOW_MESSAGE,
+                     "custom"):
+            self.app.register_event_handler(code, lambda event, data: self.handled.append(event))
+
+    def test_priority_order(self):
+        q = self.app.queue_instance
+        q.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "1"]))
+        q.put((hubQ.HUB_CODE_READY, ["spoke", False]))
+        q.put(("custom", []))
+        q.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "2"]))
+        q.put((hubQ.HUB_CODE_SHOW_MESSAGE, [None, [], None]))
+        self.app.process_events()
+
+        self.assertEqual(self.handled, [(hubQ.HUB_CODE_SHOW_MESSAGE, [None, [], None]),
+                                        ("custom", []),
+                                        (hubQ.HUB_CODE_MESSAGE, ["spoke", "1"]),
+                                        (hubQ.HUB_CODE_READY, ["spoke", False]),
+                                        (hubQ.HUB_CODE_MESSAGE, ["spoke", "2"])])
+
+    def test_input_first(self):
+        q = self.app.queue_instance
+        for i in range(100):
+            q.put((hubQ.HUB_CODE_MESSAGE, ["spoke", str(i)]))
+        q.put((hubQ.HUB_CODE_INPUT, ["answer"]))
+
+        self.assertEqual(self.app.process_events(return_at=hubQ.HUB_CODE_INPUT),
+                         (hubQ.HUB_CODE_INPUT, ["answer"]))
+        self.assertEqual(self.handled, [])
+
+        # new events of higher priority go before the waiting ones
+        q.put(("custom", []))
+        self.app.process_events()
+        self.assertEqual(len(self.handled), 101)
+        self.assertEqual(self.handled[0], ("custom", []))
+        self.assertEqual([e[1][1] for e in self.handled[1:]], [str(i) for i in range(100)])
+
+    def test_set_priority(self):
+        app = App("Test")
+        app.register_event_handler("custom", lambda event, data: self.handled.append(event))
+        app.register_event_handler("urgent", lambda event, data: self.handled.append(event))
+        app.coalesce_events("custom")
+        app.queue_instance.put((hubQ.HUB_CODE_INPUT, ["answer"]))
+        app.queue_instance.put(("custom", [1]))
+        app.queue_instance.put(("urgent", [1]))
+        app.queue_instance.put(("custom", [2]))
+        app.queue_instance.put(("urgent", [2]))
+        app.process_events(return_at=hubQ.HUB_CODE_INPUT)
+
+        # waiting events are ordered by the new priority
+        app.set_event_priority("urgent", 0)
+        app.process_events()
+        self.assertEqual(self.handled, [("urgent", [1]), ("urgent", [2]), ("custom", [2])])
+
+    def test_bounded_queue(self):
+        app = App("Test", queue_size=10, event_priorities=HUB_PRIORITIES)
+        waiting = []
+        app.register_event_handler(hubQ.HUB_CODE_MESSAGE,
+                                   lambda event, data: waiting.append(len(app._events)))
+
+        def produce():
+            for i in range(1000):
+                app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", str(i)]))
+            app.queue_instance.put((hubQ.HUB_CODE_INPUT, ["done"]))
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        app.process_events(return_at=hubQ.HUB_CODE_INPUT)
+        producer.join()
+        # messages taken together with the input
+        app.process_events()
+
+        # the producer was blocked instead of filling the events without limit
+        self.assertEqual(len(waiting), 1000)
+        self.assertLessEqual(max(waiting), 10)
+        self.assertGreater(app.metrics_snapshot()["blocked"].get(hubQ.HUB_CODE_MESSAGE, 0), 0)
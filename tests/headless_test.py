@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from simpleline.base import UIScreen
+from simpleline.headless import ScriptedInput, HeadlessDriver
+from simpleline.prompt import Prompt
+from simpleline.widgets import TextWidget
+
+
+class Spoke(UIScreen):
+    title = u"Spoke"
+
+    def __init__(self, app, hub):
+        super().__init__(app)
+        self._hub = hub
+
+    def prompt(self, args=None):
+        return Prompt(u"Enter name")
+
+    def input(self, args, key):
+        self._hub.name = key
+        self.close()
+        return None
+
+
+class Hub(UIScreen):
+    title = u"Hub"
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.name = u""
+
+    def refresh(self, args=None):
+        super().refresh(args)
+        self._window += [TextWidget(u"1) Name: %s" % self.name), u""]
+        return True
+
+    def input(self, args, key):
+        if key == "1":
+            self.app.switch_screen_with_return(Spoke(self.app, self))
+            return None
+        return key
+
+
+class HeadlessDriver_TestCase(unittest.TestCase):
+    def run_session(self, answers, **kwargs):
+        driver = HeadlessDriver(answers, **kwargs)
+        app = driver.create_app("Test")
+        hub = Hub(app)
+        app.schedule_screen(hub)
+        return driver, hub, driver.run()
+
+    def test_session(self):
+        driver, hub, result = self.run_session(["1", "John", Prompt.CONTINUE])
+        self.assertTrue(result)
+        self.assertEqual(hub.name, "John")
+        self.assertEqual(driver.input.used, 3)
+        self.assertFalse(driver.input.pending)
+
+        # hub, spoke, hub
+        self.assertEqual(driver.frames, 3)
+        times = driver.screen_times
+        self.assertEqual(times["Hub"][0], 2)
+        self.assertEqual(times["Spoke"][0], 1)
+        self.assertIn("Hub", driver.report())
+
+        lines = driver.output.get_lines()
+        self.assertIn(u"1) Name: John", lines)
+        self.assertTrue(lines[-2].startswith(u"Please make a selection"))
+
+    def test_keep_frames(self):
+        driver, _hub, _result = self.run_session(["1", "John", Prompt.CONTINUE], keep_frames=None)
+        self.assertEqual(len(driver.output.frames), 3)
+        self.assertIn(u"Enter name: ", driver.output.get_lines(1))
+
+        driver, _hub, _result = self.run_session(["1", "John", Prompt.CONTINUE])
+        self.assertEqual(len(driver.output.frames), 1)
+
+    def test_script_exhausted(self):
+        driver, hub, result = self.run_session(["1", "Jane"])
+        self.assertFalse(result)
+        self.assertEqual(hub.name, "Jane")
+        self.assertEqual(driver.frames, 3)
+
+    def test_from_file(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("1\nJohn Doe\nc\n")
+        try:
+            driver, hub, result = self.run_session(ScriptedInput.from_file(f.name))
+        finally:
+            os.unlink(f.name)
+
+        self.assertTrue(result)
+        self.assertEqual(hub.name, "John Doe")
+
+
+class FastForward_TestCase(unittest.TestCase):
+    class CountingHub(Hub):
+        refreshed = 0
+
+        def refresh(self, args=None):
+            self.refreshed += 1
+            return super().refresh(args)
+
+    def run_session(self, answers, **kwargs):
+        driver = HeadlessDriver(answers, keep_frames=None)
+        app = driver.create_app("Test", fast_forward=True)
+        hub = self.CountingHub(app)
+        for name, value in kwargs.items():
+            setattr(hub, name, value)
+        app.schedule_screen(hub)
+        return driver, hub, driver.run()
+
+    def test_skip_screens(self):
+        driver, hub, result = self.run_session(["1", "John", "1", "Jane"])
+        self.assertFalse(result)
+        self.assertEqual(hub.name, "Jane")
+
+        # only the last screen waiting for the missing answer is shown
+        self.assertEqual(driver.frames, 1)
+        self.assertEqual(hub.refreshed, 3)
+        lines = driver.output.get_lines()
+        self.assertIn(u"1) Name: Jane", lines)
+        self.assertNotIn(u"Enter name: ", lines)
+
+    def test_skip_refresh(self):
+        driver, hub, _result = self.run_session(["1", "John"], fast_forward_skip_refresh=True)
+        self.assertEqual(hub.name, "John")
+        self.assertEqual(driver.frames, 1)
+        self.assertEqual(hub.refreshed, 1)
+
+    def test_needs_attention(self):
+        driver, hub, _result = self.run_session(["1", "John"], needs_attention=True)
+        self.assertEqual(driver.frames, 2)
+        self.assertEqual(hub.refreshed, 2)
+
+    def test_invalid_answer(self):
+        driver = HeadlessDriver(ScriptedInput(["bad"], fallback=ScriptedInput(["c"])),
+                                keep_frames=None)
+        app = driver.create_app("Test", fast_forward=True)
+        app.schedule_screen(Hub(app))
+
+        self.assertTrue(driver.run())
+        # the hub is shown before the fallback is asked
+        self.assertEqual(driver.frames, 1)
+        self.assertIn(u"1) Name:", driver.output.get_lines())
+
+    def test_skipped_screen_times(self):
+        driver, _hub, _result = self.run_session(["1", "John"])
+        times = driver.screen_times
+        # the spoke is skipped, the hub is skipped once and shown once
+        self.assertEqual(times["Spoke"][0], 1)
+        self.assertEqual(times["CountingHub"][0], 2)
+
+    def test_fallback(self):
+        driver = HeadlessDriver(ScriptedInput(["1"], fallback=ScriptedInput(["Jane", "c"])))
+        app = driver.create_app("Test", fast_forward=True)
+        hub = Hub(app)
+        app.schedule_screen(hub)
+
+        self.assertTrue(driver.run())
+        self.assertEqual(hub.name, "Jane")
+        # spoke asking the fallback is shown and the hub after it
+        self.assertEqual(driver.frames, 2)
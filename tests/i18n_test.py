@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+import gettext
+import unittest
+from unittest import mock
+from simpleline.utils.i18n import _, C_, CP_, reload_translation
+
+
+class FakeTranslation(gettext.NullTranslations):
+    def gettext(self, message):
+        if message == "Test\x04hello":
+            return "ahoj"
+        return message.upper()
+
+
+class I18n_TestCase(unittest.TestCase):
+    def setUp(self):
+        reload_translation()
+
+    def tearDown(self):
+        reload_translation()
+
+    @mock.patch("gettext.translation")
+    def test_cached_catalog(self, translation):
+        translation.return_value = FakeTranslation()
+
+        self.assertEqual(_("hello"), "HELLO")
+        self.assertEqual(_("world"), "WORLD")
+        self.assertEqual(_(""), "")
+        self.assertEqual(translation.call_count, 1)
+
+        # catalog is loaded again after reload
+        reload_translation()
+        self.assertEqual(_("hello"), "HELLO")
+        self.assertEqual(translation.call_count, 2)
+
+    @mock.patch("gettext.translation")
+    def test_context_memo(self, translation):
+        translation.return_value = FakeTranslation()
+
+        self.assertEqual(C_("Test", "hello"), "ahoj")
+        self.assertEqual(C_("Test", "hello"), "ahoj")
+        self.assertEqual(C_.cache_info().hits, 1)
+        # the memo is bounded for dynamic messages
+        self.assertEqual(C_.cache_info().maxsize, CP_.cache_info().maxsize)
+        self.assertIsNotNone(C_.cache_info().maxsize)
+
+        # context is not a part of the untranslated message
+        self.assertEqual(CP_("Test", "one", "more", 1), "one")
+        self.assertEqual(CP_("Test", "one", "more", 2), "more")
+
+        # reload drops the memo so the new catalog is used
+        translation.return_value = gettext.NullTranslations()
+        reload_translation()
+        self.assertEqual(C_("Test", "hello"), "hello")
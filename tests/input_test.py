@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import io
+import unittest
+from unittest import mock
+from simpleline.base import App
+from simpleline.communication.communication import hubQ
+from simpleline.input import InputReader, ThreadInputReader
+from simpleline.output import BufferedOutput
+
+
+class ThreadInputReader_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.reader = ThreadInputReader()
+        self.app = App("Test", output=BufferedOutput(self.stream), input_reader=self.reader)
+
+    def tearDown(self):
+        self.reader.close()
+
+    @mock.patch("sys.stdin", io.StringIO(u"first\nsecond\nŽluťoučký kůň\n"))
+    def test_one_thread(self):
+        self.assertEqual(self.app.raw_input("1: "), "first")
+        thread = self.reader._thread
+        self.assertTrue(thread.is_alive())
+
+        self.assertEqual(self.app.raw_input("2: "), "second")
+        self.assertEqual(self.app.raw_input("3: "), u"Žluťoučký kůň")
+        self.assertIs(self.reader._thread, thread)
+        self.assertEqual(self.stream.getvalue(), "1: 2: 3: ")
+
+        # end of input is an empty string
+        self.assertEqual(self.app.raw_input("4: "), "")
+
+
+
+class NestedInput_TestCase(unittest.TestCase):
+    class PostingReader(InputReader):
+        def request(self, app, prompt, hidden):
+            app.queue_instance.put((hubQ.HUB_CODE_INPUT, ["answer"]))
+
+    def test_nested_input(self):
+        app = App("Test", output=BufferedOutput(io.StringIO()),
+                  input_reader=self.PostingReader())
+
+        def handler(event, data):
+            app.raw_input("nested: ")
+
+        # event handled while the input is awaited asks for another input
+        app.register_event_handler(hubQ.HUB_CODE_READY, handler)
+        app.queue_instance.put((hubQ.HUB_CODE_READY, ["spoke", False]))
+        self.assertEqual(app.raw_input("prompt: "), "answer")
+
+        # the error of the handler is queued as an exception event
+        with self.assertRaises(KeyError):
+            app.process_events()
+
+        # the next input works again
+        self.assertEqual(app.raw_input("prompt: "), "answer")
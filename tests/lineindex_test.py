@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from simpleline.utils.lineindex import LineIndex
+from simpleline.widgets import TextWidget
+
+
+class LineIndex_TestCase(unittest.TestCase):
+    LINES = [u"Installation source", u"Software selection", u"", u"Network & host name",
+             u"Root password", u"Žluťoučký kůň", u"User creation", u"installation destination"]
+
+    def test_matches(self):
+        index = LineIndex(self.LINES)
+        self.assertEqual(len(index), 8)
+        self.assertEqual(index.matches(u"installation"), [0, 7])
+        self.assertEqual(index.matches(u"TION"), [0, 1, 6, 7])
+        self.assertEqual(index.matches(u"ŽLUŤ"), [5])
+        self.assertEqual(index.matches(u"missing"), [])
+        self.assertEqual(index.matches(u"ne"), [3])
+        self.assertEqual(index.matches(u""), list(range(8)))
+
+        for text in (u"on", u"tion s", u"a", u"ware sel", u"on d", u"st"):
+            self.assertEqual(index.matches(text),
+                             [n for n, line in enumerate(self.LINES) if text in line.lower()])
+
+    def test_next_and_previous(self):
+        index = LineIndex(self.LINES)
+        self.assertEqual(index.find_next(u"installation", -1), 0)
+        self.assertEqual(index.find_next(u"installation", 0), 7)
+        self.assertIsNone(index.find_next(u"installation", 7))
+        self.assertEqual(index.find_previous(u"installation", 8), 7)
+        self.assertEqual(index.find_previous(u"installation", 7), 0)
+        self.assertIsNone(index.find_previous(u"installation", 0))
+
+    def test_empty(self):
+        index = LineIndex([])
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.matches(u"text"), [])
+        self.assertIsNone(index.find_previous(u"text", 5))
+        self.assertIsNone(LineIndex([u"a\nb"]).find_next(u"a\nb", -1))
+
+    def test_widget_index(self):
+        w = TextWidget(u"first line\nsecond line")
+        w.render(80)
+        index = w.line_index()
+        self.assertIs(w.line_index(), index)
+        self.assertEqual(index.matches(u"second"), [1])
+
+        # new render builds new index
+        w.text = u"second line\nfirst line"
+        w.render(80)
+        self.assertIsNot(w.line_index(), index)
+        self.assertEqual(w.line_index().matches(u"second"), [0])
+
+        w.write(u"third line", row=2, col=0)
+        self.assertEqual(w.line_index().matches(u"third"), [2])
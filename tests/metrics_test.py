@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+import time
+import queue
+import unittest
+from simpleline.base import App
+from simpleline.communication import EventQueue
+from simpleline.communication.communication import hubQ
+from simpleline.headless import HeadlessDriver
+from simpleline.metrics import MetricsLogger
+from simpleline.prompt import Prompt
+from tests.headless_test import Hub
+
+
+class EventQueue_TestCase(unittest.TestCase):
+    def test_metrics(self):
+        q = EventQueue()
+        for i in range(5):
+            q.put((hubQ.HUB_CODE_MESSAGE, ["spoke", str(i)]))
+        q.put((hubQ.HUB_CODE_READY, ["spoke", False]))
+        self.assertEqual(q.get(), (hubQ.HUB_CODE_MESSAGE, ["spoke", "0"]))
+        q.put("not a message")
+
+        metrics = q.metrics()
+        self.assertEqual(metrics["queue_depth"], 6)
+        self.assertEqual(metrics["queue_high_water"], 6)
+        self.assertEqual(metrics["queue_latency"][hubQ.HUB_CODE_MESSAGE]["count"], 1)
+
+        while not q.empty():
+            q.get()
+        metrics = q.metrics()
+        self.assertEqual(metrics["queue_depth"], 0)
+        self.assertEqual(metrics["queue_high_water"], 6)
+        latency = metrics["queue_latency"]
+        self.assertEqual(latency[hubQ.HUB_CODE_MESSAGE]["count"], 5)
+        self.assertEqual(latency[hubQ.HUB_CODE_READY]["count"], 1)
+        self.assertEqual(latency[None]["count"], 1)
+        self.assertGreaterEqual(latency[None]["max"], latency[None]["mean"])
+
+        q.reset_metrics()
+        self.assertEqual(q.metrics(), {"queue_size": 0, "queue_depth": 0, "queue_high_water": 0,
+                                       "queue_latency": {}, "dropped": {}, "blocked": {}})
+
+
+class AppMetrics_TestCase(unittest.TestCase):
+    def test_snapshot(self):
+        driver = HeadlessDriver(["1", "John", Prompt.CONTINUE])
+        app = driver.create_app("Test")
+        app.schedule_screen(Hub(app))
+        app.register_event_handler(hubQ.HUB_CODE_MESSAGE, lambda event, data: None)
+        for i in range(3):
+            app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", str(i)]))
+        driver.run()
+
+        snapshot = app.metrics_snapshot()
+        self.assertEqual(snapshot["queue_depth"], 0)
+        self.assertEqual(snapshot["queue_high_water"], 3)
+        self.assertEqual(snapshot["queue_latency"][hubQ.HUB_CODE_MESSAGE]["count"], 3)
+        self.assertEqual(snapshot["queue_latency"][hubQ.HUB_CODE_INPUT]["count"], 3)
+        self.assertEqual(snapshot["handler_time"][hubQ.HUB_CODE_MESSAGE]["count"], 3)
+        # the last input closes the application without another frame
+        self.assertEqual(snapshot["input_to_frame"]["count"], 2)
+
+    def test_dispatch_latency(self):
+        app = App("Test")
+        app.set_event_priority(hubQ.HUB_CODE_READY, 0)
+        app.coalesce_events(hubQ.HUB_CODE_MESSAGE)
+        app.register_event_handler(hubQ.HUB_CODE_READY, lambda event, data: time.sleep(0.05))
+        app.register_event_handler(hubQ.HUB_CODE_MESSAGE, lambda event, data: None)
+        for i in range(3):
+            app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", str(i)]))
+        app.queue_instance.put((hubQ.HUB_CODE_READY, ["spoke", False]))
+        app.process_events()
+
+        latency = app.metrics_snapshot()["queue_latency"]
+        self.assertEqual(latency[hubQ.HUB_CODE_READY]["count"], 1)
+        # the coalesced messages are not counted, the last one waited for
+        # the handler of the ready message
+        self.assertEqual(latency[hubQ.HUB_CODE_MESSAGE]["count"], 1)
+        self.assertGreaterEqual(latency[hubQ.HUB_CODE_MESSAGE]["max"], 0.05)
+
+    def test_plain_queue(self):
+        app = App("Test", queue_instance=queue.Queue())
+        app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message"]))
+        snapshot = app.metrics_snapshot()
+        self.assertEqual(snapshot["queue_depth"], 1)
+        self.assertIsNone(snapshot["queue_high_water"])
+
+    def test_log(self):
+        app = App("Test")
+        app.register_event_handler(hubQ.HUB_CODE_MESSAGE, lambda event, data: None)
+        app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message"]))
+        app.process_events()
+
+        with self.assertLogs("simpleline") as logs:
+            MetricsLogger(app).log()
+        self.assertIn("queue depth 0 (max 1)", logs.output[0])
+        self.assertIn("handler_time[%d] 1 x" % hubQ.HUB_CODE_MESSAGE, logs.output[0])
+
+    def test_periodic_log(self):
+        app = App("Test")
+        metrics_logger = MetricsLogger(app, interval=0.01)
+        with self.assertLogs("simpleline") as logs:
+            metrics_logger.start()
+            try:
+                while not logs.output:
+                    app.process_events()
+            finally:
+                metrics_logger.stop()
+        self.assertIn("input_to_frame 0 x", logs.output[0])
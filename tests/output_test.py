@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+import io
+import unittest
+from unittest import mock
+from simpleline.base import App, UIScreen
+from simpleline.output import LineOutput, BufferedOutput, AnsiOutput
+from simpleline.widgets import TextWidget
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class BytesStream(object):
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def flush(self):
+        pass
+
+
+class Output_TestCase(unittest.TestCase):
+    def test_line_output(self):
+        stream = CountingStream()
+        output = LineOutput(stream)
+        output.start_frame(u"===")
+        output.write_line(u"first")
+        output.write_line(u"second")
+        self.assertEqual(stream.getvalue(), u"===\nfirst\nsecond\n")
+        self.assertEqual(stream.writes, 3)
+
+    def test_buffered_output(self):
+        stream = CountingStream()
+        output = BufferedOutput(stream)
+        output.start_frame(u"===")
+        output.write_line(u"first")
+        output.write(u"prompt: ")
+        self.assertEqual(stream.getvalue(), u"")
+        self.assertEqual(output.pending, 18)
+
+        output.flush()
+        self.assertEqual(stream.getvalue(), u"===\nfirst\nprompt: ")
+        self.assertEqual(stream.writes, 1)
+        self.assertEqual(output.pending, 0)
+
+        # nothing to write
+        output.flush()
+        self.assertEqual(stream.writes, 1)
+
+    def test_flush_threshold(self):
+        stream = CountingStream()
+        output = BufferedOutput(stream, flush_threshold=10)
+        output.write_line(u"12345")
+        self.assertEqual(stream.writes, 0)
+        output.write_line(u"67890")
+        self.assertEqual(stream.writes, 1)
+        self.assertEqual(stream.getvalue(), u"12345\n67890\n")
+
+    def test_encoded_output(self):
+        stream = BytesStream()
+        output = BufferedOutput(stream, encoding="utf-8")
+        output.write_line(u"Žluťoučký kůň")
+        output.flush()
+        self.assertEqual(stream.buffer.getvalue(), u"Žluťoučký kůň\n".encode("utf-8"))
+
+
+class TextScreen(UIScreen):
+    def refresh(self, args=None):
+        super().refresh(args)
+        self._window += [TextWidget(u"Text of the screen"), u""]
+        return True
+
+
+class AppOutput_TestCase(unittest.TestCase):
+    @mock.patch("simpleline.base.App.raw_input", return_value="q")
+    def test_frame_in_one_write(self, raw_input):
+        stream = CountingStream()
+        app = App("Test", width=20, output=BufferedOutput(stream))
+        app.schedule_screen(TextScreen(app))
+        self.assertFalse(app.run())
+
+        self.assertEqual(stream.writes, 1)
+        self.assertEqual(stream.getvalue(), "\n".join([20 * "=", 20 * "=", "Screen..", "",
+                                                       "Text of the screen", "", ""]))
+
+
+class AnsiOutput_TestCase(unittest.TestCase):
+    def _frame(self, output, lines, prompt=u"prompt: "):
+        output.start_frame(u"===")
+        for line in lines:
+            output.write_line(line)
+        output.end_frame()
+        output.write(prompt)
+        output.flush()
+
+    def test_changed_lines_only(self):
+        stream = io.StringIO()
+        output = AnsiOutput(stream, enabled=True, height=25)
+        lines = [u"Title", u"", u"1) Spoke one", u"2) Spoke two", u"status: waiting"]
+
+        # first frame is painted as a whole
+        self._frame(output, lines)
+        self.assertEqual(stream.getvalue(), AnsiOutput.CLEAR_SCREEN + "\n".join(lines) +
+                         "\nprompt: ")
+        first_size = len(stream.getvalue())
+
+        # the same frame only clears the prompt
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, lines)
+        self.assertEqual(stream.getvalue(), "\x1b[6;1H\x1b[Jprompt: ")
+
+        # one changed and one added line
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, lines[:4] + [u"status: ready", u"new line"])
+        self.assertEqual(stream.getvalue(), "\x1b[5;1Hstatus: ready\x1b[K"
+                                            "\x1b[6;1Hnew line\x1b[K"
+                                            "\x1b[7;1H\x1b[Jprompt: ")
+        self.assertLess(len(stream.getvalue()), first_size)
+
+    def test_repaint(self):
+        stream = io.StringIO()
+        output = AnsiOutput(stream, enabled=True, height=5)
+        self._frame(output, [u"a", u"b"])
+
+        # frame longer than the screen is repainted every time
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [u"a", u"b", u"c", u"d"])
+        self._frame(output, [u"a", u"b", u"c", u"d"])
+        self.assertEqual(stream.getvalue().count(AnsiOutput.CLEAR_SCREEN), 2)
+
+        # frame interrupted by a prompt is repainted and the rest is appended
+        stream.seek(0)
+        stream.truncate()
+        output.start_frame(u"===")
+        output.write_line(u"page 1")
+        output.write(u"continue: ")
+        output.flush()
+        output.write_line(u"page 2")
+        output.end_frame()
+        output.flush()
+        self.assertEqual(stream.getvalue(), AnsiOutput.CLEAR_SCREEN + "page 1\ncontinue: page 2\n")
+
+        # so the next frame is repainted
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [u"a"])
+        self.assertTrue(stream.getvalue().startswith(AnsiOutput.CLEAR_SCREEN))
+
+    def test_wrapped_prompt(self):
+        stream = io.StringIO()
+        output = AnsiOutput(stream, enabled=True, height=5, width=10)
+        self._frame(output, [u"a", u"b", u"c"])
+
+        # the prompt fits to one row, the next frame is updated
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [u"a", u"b", u"c"], prompt=u"a long prompt: ")
+        self.assertNotIn(AnsiOutput.CLEAR_SCREEN, stream.getvalue())
+
+        # the wrapped prompt and the input scrolled the screen
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [u"a", u"b", u"c"])
+        self.assertTrue(stream.getvalue().startswith(AnsiOutput.CLEAR_SCREEN))
+
+        # error message and the prompt again after an invalid input
+        stream.seek(0)
+        stream.truncate()
+        output.write(u"invalid\n")
+        output.write(u"prompt: ")
+        self._frame(output, [u"a", u"b", u"c"])
+        self.assertTrue(stream.getvalue().startswith(u"invalid\nprompt: " +
+                                                     AnsiOutput.CLEAR_SCREEN))
+
+    def test_wrapped_lines(self):
+        stream = io.StringIO()
+        output = AnsiOutput(stream, enabled=True, height=20, width=40)
+        long_line = u"x" * 72
+        self._frame(output, [long_line, u"a", long_line])
+
+        # the wrapped lines take two rows each, the rows can't be addressed
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [long_line, u"b", long_line])
+        self.assertTrue(stream.getvalue().startswith(AnsiOutput.CLEAR_SCREEN))
+
+        # the frame after the wrapped one is repainted too
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [u"short", u"b"])
+        self.assertTrue(stream.getvalue().startswith(AnsiOutput.CLEAR_SCREEN))
+
+        # short lines are addressed again
+        stream.seek(0)
+        stream.truncate()
+        self._frame(output, [u"short", u"c"])
+        self.assertEqual(stream.getvalue(), AnsiOutput.MOVE_TO % 2 + u"c" + AnsiOutput.CLEAR_LINE +
+                         AnsiOutput.MOVE_TO % 3 + AnsiOutput.CLEAR_BELOW + u"prompt: ")
+
+    def test_dumb_terminal(self):
+        stream = io.StringIO()
+        with mock.patch.dict("os.environ", {"TERM": "xterm"}):
+            self.assertFalse(AnsiOutput.is_supported(stream))
+
+        with mock.patch.dict("os.environ", {"TERM": "dumb"}):
+            output = AnsiOutput(stream)
+        self.assertFalse(output.enabled)
+
+        self._frame(output, [u"a", u"b"])
+        self.assertEqual(stream.getvalue(), "===\na\nb\nprompt: ")
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from simpleline.base import UIScreen
+from simpleline.headless import HeadlessDriver
+from simpleline.prompt import Prompt
+from simpleline.widgets import TextWidget, StreamWidget, CenterWidget, ColumnWidget
+
+
+class LongScreen(UIScreen):
+    title = u"Long"
+
+    def __init__(self, app, widget):
+        # 5 lines of the widget on one page
+        super().__init__(app, screen_height=7)
+        self._widget = widget
+
+    def refresh(self, args=None):
+        super().refresh(args)
+        self._window += [self._widget]
+        return True
+
+
+class Pager_TestCase(unittest.TestCase):
+    def show(self, widget, answers):
+        driver = HeadlessDriver(answers + [Prompt.CONTINUE])
+        app = driver.create_app("Test")
+        app.schedule_screen(LongScreen(app, widget))
+        driver.run()
+        # the scripted answers are not echoed, the page continues on the line of the prompt
+        return [line[line.index(u"line"):] for line in driver.output.get_lines()
+                if u"line" in line]
+
+    @staticmethod
+    def source(count=12):
+        return lambda: (u"line %d\n" % i for i in range(count))
+
+    def test_all_lines(self):
+        expected = [u"line %d" % i for i in range(12)]
+        self.assertEqual(self.show(StreamWidget(self.source()), ["", ""]), expected)
+        text = TextWidget(u"\n".join(expected))
+        self.assertEqual(self.show(text, ["", ""]), expected)
+
+    def test_short_widget(self):
+        self.assertEqual(self.show(StreamWidget(self.source(5)), []),
+                         [u"line %d" % i for i in range(5)])
+
+    def test_jump(self):
+        lines = self.show(StreamWidget(self.source()), ["9", "2", "1", "", ""])
+        self.assertEqual(lines, [u"line %d" % i for i in
+                                 list(range(5)) * 2 + list(range(5, 10)) + list(range(5)) +
+                                 list(range(5, 12))])
+
+        # jump to the last page ends the paging
+        lines = self.show(StreamWidget(self.source()), ["3"])
+        self.assertEqual(lines, [u"line %d" % i for i in list(range(5)) + [10, 11]])
+
+    def test_search(self):
+        lines = self.show(StreamWidget(self.source(20)),
+                          ["/LINE 1", "/", "?", "/missing", "", "", ""])
+        self.assertEqual(lines, [u"line %d" % i for i in
+                                 list(range(5)) * 2 + list(range(10, 15)) + list(range(5)) * 2 +
+                                 list(range(5, 20))])
+
+        # the lines of other widgets are searched too
+        lines = self.show(TextWidget(u"\n".join(u"line %d" % i for i in range(20))),
+                          ["?7", "/7", "/"])
+        self.assertEqual(lines, [u"line %d" % i for i in
+                                 list(range(5)) * 2 + list(range(5, 10)) + list(range(15, 20))])
+
+    def test_not_seekable(self):
+        lines = self.show(StreamWidget(u"line %d" % i for i in range(12)), ["1", "/line 0"])
+        self.assertEqual(lines, [u"line %d" % i for i in range(12)])
+
+    def test_prompt(self):
+        for widget, searchable in ((StreamWidget(self.source()), True),
+                                   (StreamWidget(iter(self.source()())), False)):
+            driver = HeadlessDriver(["", "", Prompt.CONTINUE])
+            app = driver.create_app("Test")
+            app.schedule_screen(LongScreen(app, widget))
+            driver.run()
+            output = u"\n".join(driver.output.get_lines())
+            self.assertIn(u"Press %s to continue" % Prompt.ENTER, output)
+            self.assertEqual(u"/text to search" in output, searchable)
+
+
+class StreamWidget_TestCase(unittest.TestCase):
+    def test_lazy(self):
+        produced = []
+
+        def source():
+            for i in range(1000):
+                produced.append(i)
+                yield u"line %d" % i
+
+        w = StreamWidget(source)
+        w.render(80)
+        self.assertEqual(w.get_line_range(0, 3), [u"line 0", u"line 1", u"line 2"])
+        self.assertEqual(w.get_line_range(2, 4), [u"line 2", u"line 3"])
+        self.assertEqual(len(produced), 4)
+        self.assertEqual(w.get_line_range(998, 1005), [u"line 998", u"line 999"])
+        self.assertEqual(w.get_line_range(1, 2), [u"line 1"])
+
+    def test_wrap(self):
+        w = StreamWidget([u"a" * 25, u"", u"short"])
+        w.render(10)
+        self.assertEqual(w.get_lines(), [u"a" * 10, u"a" * 10, u"a" * 5, u"", u"short"])
+        self.assertFalse(w.seekable)
+        # the built lines are kept until the width changes
+        self.assertEqual(w.get_line_range(3, 5), [u"", u"short"])
+        w.render(12)
+        self.assertRaises(ValueError, w.get_line_range, 0, 1)
+
+    def test_center(self):
+        lines = [u"first", u"second line"]
+        w = CenterWidget(StreamWidget(iter(lines)))
+        w.render(21)
+        self.assertEqual(w.get_lines(), [u"     first", u"     second line"])
+        # the render of the same width reuses the lines read from the iterator
+        w.render(21)
+        self.assertEqual(w.get_lines(), [u"     first", u"     second line"])
+
+    def test_columns(self):
+        stream = StreamWidget(lambda: iter([u"a", u"b", u"c"]))
+        w = ColumnWidget([(5, [stream]), (5, [TextWidget(u"x")])], spacing=1)
+        w.render(11)
+        self.assertEqual(w.get_lines(), [u"a     x", u"b", u"c"])
+
+    def test_buffer_range(self):
+        w = TextWidget(u"a\nb\nc")
+        w.render(80)
+        self.assertEqual(w.get_line_range(1, 5), [u"b", u"c"])
+        self.assertEqual(list(w.iter_lines()), [u"a", u"b", u"c"])
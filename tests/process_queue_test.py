@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+import unittest
+from simpleline.base import App
+from simpleline.communication.communication import hubQ, attach_hub_queue
+
+
+def report_progress(spoke, steps):
+    for i in range(steps):
+        hubQ.send_message(spoke, "step %d" % i)
+    hubQ.send_ready(spoke, False)
+    return spoke
+
+
+class ProcessTransport_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = App("Test", queue_instance=hubQ.q)
+        self.messages = []
+        self.ready = []
+        self.app.register_event_handler(hubQ.HUB_CODE_MESSAGE,
+                                        lambda event, data: self.messages.append(event[1]))
+        self.app.register_event_handler(hubQ.HUB_CODE_READY,
+                                        lambda event, data: self.ready.append(event[1][0]))
+        self.addCleanup(hubQ.stop_process_transport)
+
+    def process_until_ready(self, count):
+        for _i in range(count):
+            event = self.app.process_events(return_at=hubQ.HUB_CODE_READY)
+            self.ready.append(event[1][0])
+
+    def test_spawned_process(self):
+        context = multiprocessing.get_context("spawn")
+        remote = hubQ.start_process_transport(context)
+        process = context.Process(target=self._spawned_main, args=(remote, "spoke", 5))
+        process.start()
+        process.join(30)
+        self.assertEqual(process.exitcode, 0)
+
+        self.process_until_ready(1)
+        self.assertEqual(self.messages, [("spoke", "step %d" % i) for i in range(5)])
+        self.assertEqual(self.ready, ["spoke"])
+
+    @staticmethod
+    def _spawned_main(remote, spoke, steps):
+        attach_hub_queue(remote)
+        report_progress(spoke, steps)
+
+    @unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "fork is not available")
+    def test_forked_pool(self):
+        context = multiprocessing.get_context("fork")
+        hubQ.start_process_transport(context)
+        with context.Pool(2) as pool:
+            spokes = pool.starmap(report_progress, [("spoke%d" % i, 3) for i in range(4)])
+
+        self.process_until_ready(4)
+        self.assertEqual(sorted(self.ready), sorted(spokes))
+        for spoke in spokes:
+            self.assertEqual([m for s, m in self.messages if s == spoke],
+                             ["step 0", "step 1", "step 2"])
+
+    def test_local_messages(self):
+        hubQ.start_process_transport()
+        # messages of the process running the App do not go through the transport
+        report_progress("local", 2)
+        self.assertEqual(hubQ.q.qsize(), 3)
+        self.app.process_events()
+        self.assertEqual(self.ready, ["local"])
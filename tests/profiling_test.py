@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import tempfile
+import unittest
+from simpleline.communication.communication import hubQ
+from simpleline.headless import HeadlessDriver
+from simpleline.profiling import Tracer
+from simpleline.prompt import Prompt
+from simpleline.widgets import CenterWidget, ColumnWidget, TextWidget
+from tests.headless_test import Hub
+
+
+class Tracer_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.tracer = Tracer()
+        self.driver = HeadlessDriver(["1", "John", Prompt.CONTINUE])
+        self.app = self.driver.create_app("Test", tracer=self.tracer)
+        self.app.schedule_screen(Hub(self.app))
+
+    def test_app_spans(self):
+        def handler(event, data):
+            pass
+
+        self.app.register_event_handler(hubQ.HUB_CODE_MESSAGE, handler)
+        self.app.queue_instance.put((hubQ.HUB_CODE_MESSAGE, ["spoke", "message"]))
+        hooked = []
+        self.tracer.add_hook(hooked.append)
+        self.driver.run()
+
+        stats = self.tracer.stats()
+        self.assertEqual(stats[("setup", "Hub", None)][0], 1)
+        self.assertEqual(stats[("setup", "Spoke", None)][0], 1)
+        self.assertEqual(stats[("refresh", "Hub", None)][0], 2)
+        self.assertEqual(stats[("show_all", "Spoke", None)][0], 1)
+        self.assertEqual(stats[("render", "Hub", "TextWidget")][0], 2)
+        self.assertEqual(stats[("prompt", "Hub", None)][0], 2)
+        self.assertEqual(stats[("input", "Spoke", None)][0], 1)
+        self.assertEqual(stats[("input_wait", "Hub", None)][0], 2)
+        handler_key = ("handler", None, handler.__qualname__)
+        self.assertEqual(stats[handler_key][0], 1)
+        self.assertEqual(len(hooked), len(self.tracer.records))
+
+        summary = self.tracer.summary().splitlines()
+        self.assertEqual(len(summary), len(stats) + 1)
+        self.assertTrue(summary[0].startswith("phase"))
+
+    def test_chrome_trace(self):
+        self.driver.run()
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            path = f.name
+        try:
+            self.tracer.dump_chrome_trace(path)
+            with open(path, "r") as f:
+                trace = json.load(f)
+        finally:
+            os.unlink(path)
+
+        events = trace["traceEvents"]
+        self.assertEqual(len(events), len(self.tracer.records))
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["ts"], 0)
+            self.assertGreaterEqual(event["dur"], 0)
+        self.assertIn("render TextWidget", [e["name"] for e in events])
+
+    def test_no_tracer(self):
+        self.app.tracer = None
+        self.assertTrue(self.driver.run())
+        self.assertEqual(len(self.tracer.records), 0)
+
+    def test_nested_widgets(self):
+        class ColumnHub(Hub):
+            def refresh(self, args=None):
+                super().refresh(args)
+                self._window.append(CenterWidget(ColumnWidget([(10, [TextWidget(u"a")]),
+                                                               (10, [TextWidget(u"b")])])))
+                return True
+
+        driver = HeadlessDriver([Prompt.CONTINUE])
+        app = driver.create_app("Test", tracer=self.tracer)
+        app.schedule_screen(ColumnHub(app))
+        driver.run()
+
+        stats = self.tracer.stats()
+        self.assertEqual(stats[("render", "ColumnHub", "CenterWidget")][0], 1)
+        self.assertEqual(stats[("render", "ColumnHub", "ColumnWidget")][0], 1)
+        # the hub text widget and the two in the columns
+        self.assertEqual(stats[("render", "ColumnHub", "TextWidget")][0], 3)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import os
+import shutil
+import tempfile
+import unittest
+from simpleline.adv_widgets import HelpScreen
+from simpleline.headless import HeadlessDriver
+from simpleline.utils.textfile import TextFileCache
+from simpleline.widgets import render_stats
+
+
+class TextFileCache_TestCase(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def create(self, name, data, mtime=None):
+        path = os.path.join(self._dir, name)
+        with open(path, "wb") as f:
+            f.write(data.encode("utf-8"))
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_hits_and_misses(self):
+        cache = TextFileCache()
+        path = self.create("help.txt", u"Žluťoučký kůň\n", mtime=1000)
+
+        text = cache.read(path, "utf-8")
+        self.assertEqual(text, u"Žluťoučký kůň\n")
+        self.assertIs(cache.read(path, "utf-8"), text)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # changed file is read again
+        self.create("help.txt", u"new help\n", mtime=2000)
+        self.assertEqual(cache.read(path, "utf-8"), u"new help\n")
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 1))
+
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    def test_mmap(self):
+        cache = TextFileCache()
+        cache.MMAP_THRESHOLD = 1
+        path = self.create("help.txt", u"ďábelské\r\nódy\rkůň\n")
+        self.assertEqual(cache.read(path, "utf-8"), u"ďábelské\nódy\nkůň\n")
+
+        empty = self.create("empty.txt", u"")
+        self.assertEqual(cache.read(empty), u"")
+
+    def test_lru_eviction(self):
+        cache = TextFileCache(maxsize=2)
+        paths = [self.create(name, name) for name in ("a", "b", "c")]
+        cache.read(paths[0])
+        cache.read(paths[1])
+        cache.read(paths[0])
+        cache.read(paths[2])
+        self.assertEqual(len(cache), 2)
+
+        cache.read(paths[0])
+        self.assertEqual(cache.hits, 2)
+        cache.read(paths[1])
+        self.assertEqual(cache.misses, 4)
+
+        cache.maxsize = 0
+        cache.read(paths[1])
+        self.assertEqual(len(cache), 0)
+
+    def test_missing_file(self):
+        self.assertRaises(OSError, TextFileCache().read, os.path.join(self._dir, "missing"))
+
+
+class HelpScreen_TestCase(unittest.TestCase):
+    def test_render_once(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as f:
+            f.write("The help text.\n")
+        try:
+            driver = HeadlessDriver([""])
+            app = driver.create_app("Test")
+            screen = HelpScreen(app, f.name)
+            app.schedule_screen(screen)
+            driver.run()
+
+            performed = render_stats.total_performed
+            screen.refresh()
+            screen.show_all()
+            screen.refresh()
+            screen.show_all()
+        finally:
+            os.unlink(f.name)
+
+        self.assertEqual(render_stats.total_performed, performed)
+        self.assertIn(u"The help text.", driver.output.get_lines())
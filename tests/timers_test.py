@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+import io
+import threading
+import unittest
+from simpleline.base import App
+from simpleline.communication.communication import hubQ
+from simpleline.headless import FrameCapture
+from simpleline.input import InputReader
+from simpleline.output import BufferedOutput
+from simpleline.prompt import Prompt
+from simpleline.widgets import TextWidget
+from tests.headless_test import Hub
+
+
+class SilentReader(InputReader):
+    """The user never answers, timers have to provide the input."""
+
+    def request(self, app, prompt, hidden):
+        pass
+
+
+class Timers_TestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = App("Test", output=BufferedOutput(io.StringIO()), input_reader=SilentReader())
+        self.calls = []
+
+    def answer(self, text):
+        self.app.queue_instance.put((hubQ.HUB_CODE_INPUT, [text]))
+
+    def test_call_later(self):
+        self.app.call_later(0.02, self.calls.append, "second")
+        self.app.call_later(0.01, self.calls.append, "first")
+        self.app.call_later(0.03, self.answer, "done")
+        cancelled = self.app.call_later(0.01, self.calls.append, "cancelled")
+        cancelled.cancel()
+
+        # timers run while the input is awaited
+        self.assertEqual(self.app.raw_input("prompt"), "done")
+        self.assertEqual(self.calls, ["first", "second"])
+
+    def test_call_every(self):
+        def tick():
+            self.calls.append("tick")
+            if len(self.calls) == 3:
+                handle.cancel()
+                self.app.call_later(0.03, self.answer, "done")
+
+        handle = self.app.call_every(0.005, tick)
+        self.assertEqual(self.app.raw_input("prompt"), "done")
+        self.assertEqual(self.calls, ["tick"] * 3)
+        self.assertTrue(handle.cancelled)
+
+    def test_due_without_wait(self):
+        self.app.call_later(0, self.calls.append, "now")
+        self.app.process_events()
+        self.assertEqual(self.calls, ["now"])
+
+    def test_other_thread(self):
+        # the UI thread waits without timeout until the timer is added
+        thread = threading.Timer(0.02, self.app.call_later, args=(0, self.answer, "done"))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.assertEqual(self.app.raw_input("prompt"), "done")
+
+    def test_exception(self):
+        def fail():
+            raise RuntimeError("timer failed")
+
+        self.app.call_later(0, fail)
+        with self.assertRaises(RuntimeError):
+            self.app.process_events()
+
+    def test_refresh_screen(self):
+        output = FrameCapture(keep_frames=None)
+        app = App("Test", output=output, input_reader=SilentReader())
+        hub = Hub(app)
+        app.schedule_screen(hub)
+
+        def tick():
+            hub.name += "x"
+            app.refresh_screen()
+            if hub.name == "xx":
+                handle.cancel()
+                app.queue_instance.put((hubQ.HUB_CODE_INPUT, [Prompt.CONTINUE]))
+
+        handle = app.call_every(0.01, tick)
+        self.assertTrue(app.run())
+        self.assertEqual(output.frame_count, 3)
+        lines = output.get_lines(2)
+        self.assertIn(u"1) Name: xx", lines)
+        self.assertTrue(lines[-2].startswith(u"Please make a selection"))
+
+    def test_invalid_interval(self):
+        self.assertRaises(ValueError, self.app.call_every, 0, self.calls.append, "never")
+        self.assertRaises(ValueError, self.app.call_every, -1, self.calls.append, "never")
+
+    class LongHub(Hub):
+        def __init__(self, app):
+            super().__init__(app)
+            self._screen_height = 5
+
+        def refresh(self, args=None):
+            super().refresh(args)
+            self._window.append(TextWidget(u"\n".join(u"line %d" % i for i in range(10))))
+            return True
+
+    def test_refresh_long_screen(self):
+        output = FrameCapture(keep_frames=None)
+        app = App("Test", output=output, input_reader=SilentReader())
+        hub = self.LongHub(app)
+        app.schedule_screen(hub)
+
+        def refresh():
+            # the first page of the widget waits for the input
+            app.refresh_screen()
+            for answer in ("", "", "", Prompt.CONTINUE):
+                app.queue_instance.put((hubQ.HUB_CODE_INPUT, [answer]))
+
+        app.call_later(0.01, refresh)
+        self.assertTrue(app.run())
+        self.assertEqual(output.frame_count, 2)
+        # only the first page is shown during the input
+        lines = output.get_lines(1)
+        self.assertIn(u"line 2", lines)
+        self.assertNotIn(u"line 3", lines)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+
+import random
+import unittest
+from textwrap import wrap
+from simpleline.buffers import CharListBuffer, RowStringBuffer
+from simpleline.widgets import Widget
+
+
+def typewriter_write(buf, cursor, max_width, text, row=None, col=None, width=None,
+                     block=False, wordwrap=False):
+    """Reference implementation typing one character at a time.
+
+    This is the original Widget.write() algorithm working on a list of
+    lists of characters. Returns the new cursor position.
+    """
+    if not text:
+        return cursor
+
+    if row is None:
+        row = cursor[0]
+
+    if col is None:
+        col = cursor[1]
+
+    if width is None and max_width:
+        width = max_width - col
+
+    x = row
+    y = col
+
+    if wordwrap:
+        lines = []
+        for line in text.split('\n'):
+            sublines = []
+            for subline in wrap(line, width):
+                sublines.append(subline)
+                if len(subline) < width:
+                    sublines.append('\n')
+            if sublines and sublines[-1] == '\n':
+                sublines.pop()
+            lines.append("".join(sublines))
+        text = '\n'.join(lines)
+
+    for character in text:
+        if character == "\n":
+            x += 1
+            if block:
+                y = col
+            else:
+                y = 0
+            continue
+
+        if x >= len(buf):
+            for _i in range(x - len(buf) + 1):
+                buf.append(list())
+
+        if y >= len(buf[x]):
+            buf[x] += ((y - len(buf[x]) + 1) * list(u" "))
+
+        buf[x][y] = character
+
+        y += 1
+        if not width is None and y >= col + width:
+            x += 1
+            if block:
+                y = col
+            else:
+                y = 0
+
+    return (x, y)
+
+
+class WidgetWrite_TestCase(unittest.TestCase):
+    """Compare Widget.write() with the reference typing machine."""
+
+    WORDS = [u"a", u"be", u"cat", u"dlouhý", u"Žluťoučký", u"kůň", u"x" * 17,
+             u"word", u"", u"\n", u"\n\n", u"  "]
+
+    def setUp(self):
+        self._buffer_class = Widget.buffer_class
+        self._random = random.Random(42)
+
+    def tearDown(self):
+        Widget.buffer_class = self._buffer_class
+
+    def _random_text(self):
+        words = self._random.choices(self.WORDS, k=self._random.randint(0, 30))
+        return u" ".join(words)
+
+    def _random_args(self, wordwrap):
+        kwargs = {"block": self._random.random() < 0.5, "wordwrap": wordwrap}
+        if self._random.random() < 0.7:
+            kwargs["row"] = self._random.randint(0, 4)
+        if self._random.random() < 0.7:
+            kwargs["col"] = self._random.randint(0, 12)
+        if wordwrap or self._random.random() < 0.8:
+            kwargs["width"] = self._random.randint(1, 25)
+        return kwargs
+
+    def _compare(self, max_width, writes):
+        expected = []
+        cursor = (0, 0)
+        w = Widget(max_width=max_width)
+
+        for text, kwargs in writes:
+            cursor = typewriter_write(expected, cursor, max_width, text, **kwargs)
+            w.write(text, **kwargs)
+
+            msg = "%r written with %r" % (text, kwargs)
+            self.assertEqual(w.get_lines(), ["".join(l) for l in expected], msg)
+            self.assertEqual(w.cursor, cursor, msg)
+            self.assertEqual(w.height, len(expected), msg)
+
+    def _run_random(self, buffer_class, wordwrap):
+        Widget.buffer_class = buffer_class
+        for _i in range(300):
+            max_width = self._random.choice([None, 10, 80])
+            writes = [(self._random_text(), self._random_args(wordwrap))
+                      for _j in range(self._random.randint(1, 4))]
+            self._compare(max_width, writes)
+
+    def test_random_writes(self):
+        for buffer_class in (CharListBuffer, RowStringBuffer):
+            self._run_random(buffer_class, wordwrap=False)
+
+    def test_random_wordwrap_writes(self):
+        for buffer_class in (CharListBuffer, RowStringBuffer):
+            self._run_random(buffer_class, wordwrap=True)
+
+    def test_edge_cases(self):
+        cases = [
+            # text ending exactly at the wrapping column
+            (u"abcde", {"width": 5}),
+            (u"abcde\nfg", {"width": 5}),
+            (u"abcde\nfg", {"width": 5, "col": 3, "block": True}),
+            # wrapping without block continues from the first column
+            (u"abcdefghijklmnop", {"width": 4, "col": 6}),
+            # trailing and leading newlines do not create rows
+            (u"\n\nabc\n\n", {}),
+            (u"abc\n", {"row": 2, "col": 4}),
+            # width smaller than one character
+            (u"abc", {"width": 0}),
+            (u"abc", {"width": -3, "col": 2, "block": True}),
+            # overwrite of existing content
+            (u"xyz", {"row": 0, "col": 1}),
+        ]
+        for buffer_class in (CharListBuffer, RowStringBuffer):
+            Widget.buffer_class = buffer_class
+            for max_width in (None, 7):
+                self._compare(max_width, [(u"0123456789", {})] + cases)
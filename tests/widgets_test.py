@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 
 import unittest
-from simpleline.widgets import TextWidget, ColumnWidget
+from simpleline.buffers import CharListBuffer, RowStringBuffer
+from simpleline.widgets import Widget, TextWidget, ColumnWidget, CenterWidget, \
+    CheckboxWidget, ListWidget, LogWidget, render_stats
 
 
 class Widgets_TestCase(unittest.TestCase):
@@ -89,3 +91,283 @@ class Widgets_TestCase(unittest.TestCase):
 
         self.evaluate_result(res_lines, expected_result)
 
+
+
+class RowStringBufferWidgets_TestCase(Widgets_TestCase):
+    """Run all the widget tests again with rows stored as strings."""
+
+    def setUp(self):
+        self._buffer_class = Widget.buffer_class
+        Widget.buffer_class = RowStringBuffer
+        super().setUp()
+
+    def tearDown(self):
+        Widget.buffer_class = self._buffer_class
+
+    def test_content(self):
+        w = Widget(default=u"first\nsecond")
+        self.assertEqual(w.content, [u"first", u"second"])
+        self.assertEqual(w.width, 6)
+        self.assertEqual(w.height, 2)
+
+        w.write(u"X", row=3, col=2)
+        self.assertEqual(w.get_lines(), [u"first", u"second", u"", u"  X"])
+
+
+class MixedBuffers_TestCase(unittest.TestCase):
+    def test_draw_between_buffers(self):
+        for outer, inner in ((CharListBuffer, RowStringBuffer),
+                             (RowStringBuffer, CharListBuffer)):
+            w = TextWidget(u"Žluťoučký kůň")
+            w._buffer = inner()
+            c = CenterWidget(w)
+            c._buffer = outer()
+            c.render(21)
+            self.assertEqual(c.get_lines(), [u"    Žluťoučký kůň"])
+
+
+class WidgetWidth_TestCase(unittest.TestCase):
+    def test_width_tracking(self):
+        for buffer_class in (CharListBuffer, RowStringBuffer):
+            w = Widget()
+            w._buffer = buffer_class()
+            self.assertEqual(w.width, 0)
+
+            w.write(u"abc", row=2, col=3)
+            self.assertEqual(w.width, 6)
+
+            # overwrite does not change the width
+            w.write(u"x", row=0, col=1)
+            self.assertEqual(w.width, 6)
+
+            w.draw(Widget(default=u"12345\n1"), row=1, col=4)
+            self.assertEqual(w.width, 9)
+            self.assertEqual(w.width, max(len(l) for l in w.get_lines()))
+
+            w.clear()
+            self.assertEqual(w.width, 0)
+
+
+class RenderCache_TestCase(unittest.TestCase):
+    def setUp(self):
+        Widget.render_cache = True
+        self.t1 = TextWidget(u"First")
+        self.t2 = TextWidget(u"Second")
+        self.check = CheckboxWidget(title=u"Checkbox", completed=False)
+        self.column = ColumnWidget([(10, [self.t1]), (20, [self.t2, self.check])], 1)
+        self.top = CenterWidget(self.column)
+
+    def tearDown(self):
+        Widget.render_cache = False
+
+    def _update(self, width=40):
+        render_stats.begin_frame()
+        self.top.update(width)
+        render_stats.end_frame()
+        return render_stats.history[-1]
+
+    def test_skip_unchanged(self):
+        # first render performs everything including two text widgets
+        # created by the checkbox
+        self.assertEqual(self._update(), (7, 0))
+        lines = self.top.get_lines()
+
+        # nothing changed, the top widget is skipped
+        self.assertEqual(self._update(), (0, 1))
+        self.assertEqual(self.top.get_lines(), lines)
+
+        # different width renders the containers again, columns have
+        # the same width so their content is reused
+        self.assertEqual(self._update(50), (2, 3))
+
+    def test_dirty_propagation(self):
+        self._update()
+        self.assertFalse(self.top.dirty)
+
+        self.t2.text = u"Changed"
+        self.assertTrue(self.t2.dirty)
+        self.assertTrue(self.column.dirty)
+        self.assertTrue(self.top.dirty)
+        self.assertFalse(self.t1.dirty)
+        self.assertFalse(self.check.dirty)
+
+        # only the changed widget and its parents are rendered
+        self.assertEqual(self._update(), (3, 2))
+        self.assertIn(u"Changed", self.top.get_lines()[0])
+
+        self.check.completed = True
+        self.assertEqual(self._update(), (5, 2))
+        self.assertIn(u"[x]", self.top.get_lines()[1])
+
+    def test_disabled_cache(self):
+        Widget.render_cache = False
+        self._update()
+        self.assertEqual(self._update(), (7, 0))
+
+
+class ListWidget_TestCase(unittest.TestCase):
+    class CountingSource(object):
+        """Lazy source of a million items counting items taken."""
+
+        def __init__(self):
+            self.taken = 0
+
+        def __len__(self):
+            return 1000000
+
+        def __getitem__(self, index):
+            self.taken += 1
+            return u"item %d" % index
+
+    def test_pages(self):
+        w = ListWidget([u"first", u"second", u"third"], page_size=2)
+        w.render(80)
+        self.assertEqual(w.get_lines(), [u"1) first", u"2) second", u"Items 1-2 of 3"])
+        self.assertEqual(w.page_count, 2)
+
+        self.assertTrue(w.next_page())
+        self.assertFalse(w.next_page())
+        w.render(80)
+        self.assertEqual(w.get_lines(), [u"3) third", u"Items 3-3 of 3"])
+
+        self.assertTrue(w.previous_page())
+        self.assertFalse(w.previous_page())
+        self.assertEqual(w.page, 0)
+
+    def test_lazy_source(self):
+        source = self.CountingSource()
+        w = ListWidget(source, page_size=10, numbered=False)
+        w.jump_to(123456)
+        self.assertEqual(w.page, 12345)
+        w.render(80)
+
+        lines = w.get_lines()
+        self.assertEqual(lines[0], u"item 123450")
+        self.assertEqual(lines[-1], u"Items 123451-123460 of 1000000")
+        self.assertEqual(source.taken, 10)
+        self.assertEqual(w.get_item(999999), u"item 999999")
+        with self.assertRaises(IndexError):
+            w.get_item(1000000)
+
+    def test_function_source(self):
+        calls = []
+
+        def fetch(start, stop):
+            calls.append((start, stop))
+            return [u"package-%d" % i for i in range(start, stop)]
+
+        with self.assertRaises(ValueError):
+            ListWidget(fetch)
+
+        w = ListWidget(fetch, page_size=3, length=20000, show_status=False)
+        w.show_page(10000)
+        w.render(80)
+        self.assertEqual(w.get_lines(), [u"19999) package-19998", u"20000) package-19999"])
+        self.assertEqual(calls, [(19998, 20000)])
+
+    def test_formatter(self):
+        def formatter(index, item):
+            if index == 0:
+                return CheckboxWidget(title=item, completed=True)
+            return u"%s: %s" % (index, item)
+
+        w = ListWidget([u"disk", u"a long description of the second disk"], formatter=formatter)
+        w.render(20)
+        self.assertEqual(w.get_lines(), [u"[x] disk", u"1: a long", u"description of the", u"second disk"])
+
+    def test_render_cache(self):
+        w = ListWidget(range(100), page_size=10)
+        w.render_cache = True
+        self.assertTrue(w.update(80))
+        self.assertFalse(w.update(80))
+        w.next_page()
+        self.assertTrue(w.update(80))
+
+        # showing the same page does not need another render
+        w.show_page(1)
+        self.assertFalse(w.update(80))
+
+    def test_length(self):
+        items = list(range(30))
+        w = ListWidget(items, page_size=10)
+        w.show_page(2)
+        del items[15:]
+        w.length = len(items)
+        self.assertEqual(w.page, 1)
+        self.assertEqual(list(w.visible_range), list(range(10, 15)))
+
+
+class LogWidget_TestCase(unittest.TestCase):
+    class CountingLog(LogWidget):
+        wrapped = 0
+
+        def _wrap_line(self, text, width):
+            self.wrapped += 1
+            return super()._wrap_line(text, width)
+
+    def test_tail(self):
+        w = LogWidget(capacity=5, visible_lines=3)
+        w.update(80)
+        self.assertEqual(w.get_lines(), [])
+
+        w.append(u"line 1\nline 2\n")
+        for i in range(3, 8):
+            w.append(u"line %d" % i)
+        self.assertEqual(len(w), 5)
+        self.assertEqual(w.lines, [u"line %d" % i for i in range(3, 8)])
+
+        w.update(80)
+        self.assertEqual(w.get_lines(), [u"line 5", u"line 6", u"line 7"])
+
+        w.clear_log()
+        w.update(80)
+        self.assertEqual(w.get_lines(), [])
+
+    def test_wrap(self):
+        w = LogWidget(visible_lines=4)
+        w.append(u"first")
+        w.append(u"")
+        w.append(u"a long line wrapped to rows")
+        w.update(10)
+        self.assertEqual(w.get_lines(), [u"a long", u"line", u"wrapped to", u"rows"])
+
+        w.visible_lines = 6
+        w.update(10)
+        self.assertEqual(w.get_lines(), [u"first", u"", u"a long", u"line", u"wrapped to", u"rows"])
+
+    def test_incremental_wrap(self):
+        w = self.CountingLog(capacity=10000, visible_lines=5)
+        for i in range(10000):
+            w.append(u"line %d" % i)
+        self.assertTrue(w.update(80))
+        self.assertEqual(w.wrapped, 5)
+
+        # nothing new, render is skipped
+        self.assertFalse(w.update(80))
+
+        w.append(u"new line")
+        self.assertTrue(w.update(80))
+        self.assertEqual(w.wrapped, 6)
+        self.assertEqual(w.get_lines()[-1], u"new line")
+
+        # other width wraps the visible lines again
+        w.update(40)
+        self.assertEqual(w.wrapped, 11)
+
+    def test_append_during_render(self):
+        class RacingLog(LogWidget):
+            def render(self, width):
+                super().render(width)
+                # another thread appends after the lines were taken
+                if len(self) == 1:
+                    self.append(u"late line")
+
+        w = RacingLog(visible_lines=5)
+        w.append(u"first")
+        self.assertTrue(w.update(80))
+        self.assertEqual(w.get_lines(), [u"first"])
+
+        # the late line is rendered next time
+        self.assertTrue(w.dirty)
+        self.assertTrue(w.update(80))
+        self.assertEqual(w.get_lines(), [u"first", u"late line"])
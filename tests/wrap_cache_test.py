@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+
+import unittest
+from simpleline.utils.wrap import WrapCache, wordwrap_text
+
+
+class WrapCache_TestCase(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = WrapCache(maxsize=10)
+        text = u"Žluťoučký kůň úpěl ďábelské ódy"
+
+        self.assertEqual(cache.wrap(text, 10), wordwrap_text(text, 10))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        self.assertEqual(cache.wrap(text, 10), wordwrap_text(text, 10))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # different width is a different layout
+        self.assertEqual(cache.wrap(text, 15), wordwrap_text(text, 15))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(len(cache), 2)
+
+        cache.clear()
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 0, 0))
+
+    def test_lru_eviction(self):
+        cache = WrapCache(maxsize=2)
+        cache.wrap(u"a", 5)
+        cache.wrap(u"b", 5)
+        # use "a" so "b" is the least recently used
+        cache.wrap(u"a", 5)
+        cache.wrap(u"c", 5)
+        self.assertEqual(len(cache), 2)
+
+        cache.wrap(u"a", 5)
+        self.assertEqual(cache.hits, 2)
+        cache.wrap(u"b", 5)
+        self.assertEqual(cache.misses, 4)
+
+    def test_maxsize(self):
+        cache = WrapCache(maxsize=5)
+        for i in range(5):
+            cache.wrap(u"text %d" % i, 10)
+        self.assertEqual(len(cache), 5)
+
+        cache.maxsize = 2
+        self.assertEqual(len(cache), 2)
+
+        # zero size disables the cache
+        cache.maxsize = 0
+        self.assertEqual(len(cache), 0)
+        cache.wrap(u"text", 10)
+        cache.wrap(u"text", 10)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 7, 0))
+
+    def test_maxchars(self):
+        cache = WrapCache(maxchars=400)
+        for i in range(10):
+            cache.wrap(u"%d" % i * 30, 10)
+        # every entry takes the text and the wrapped copy, 30 + 30 characters
+        self.assertEqual((len(cache), cache.chars), (6, 360))
+
+        # texts above a quarter of the limit are not cached
+        cache.wrap(u"x" * 60, 10)
+        self.assertEqual(len(cache), 6)
+
+        cache.maxchars = 100
+        self.assertEqual((len(cache), cache.chars), (1, 60))
+
+        cache.clear()
+        self.assertEqual(cache.chars, 0)